@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict, List
 import os
 from dotenv import load_dotenv
 
@@ -10,13 +10,116 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_BACKEND: str = "auto"  # "jose", "pyjwt" or "auto" (PyJWT, which decodes faster, when installed)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000  # Verified tokens kept decoded until they expire; 0 disables
+    USER_CACHE_TTL: float = 60.0  # Seconds an authenticated user is served from memory; 0 disables
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    ADMIN_EMAILS: List[str] = []  # Users allowed to call the /admin endpoints, e.g. '["ops@example.com"]'
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Cost factor for new hashes; existing ones are upgraded on the next login
+    PASSWORD_HASH_WORKERS: int = max(1, (os.cpu_count() or 2) // 2)  # bcrypt threads; 0 hashes on the event loop
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Hashes queued or running before logins get 503
+    PASSWORD_HASH_NICE: int = 10  # Scheduling niceness of hashing threads (Linux); 0 leaves it unchanged
+
+    # Database access from async code
+    DB_OFFLOAD: bool = True  # Run blocking Session calls in a thread pool instead of on the event loop
+    DB_THREAD_POOL_SIZE: int = 10
+
+    # Write-behind persistence of search results
+    RESULT_QUEUE_MAX_SIZE: int = 10000  # Rows waiting to be written before searches block
+    RESULT_WRITE_BATCH_SIZE: int = 500  # Rows per INSERT batch
+    RESULT_FLUSH_INTERVAL: float = 1.0  # Max seconds a row waits for its batch to fill
+    
+    # Retention and compaction of stored search results
+    RESULT_RETENTION_DAYS: int = 30  # search_results rows and finished scrape jobs older than this are deleted; 0 keeps everything
+    RETENTION_BATCH_SIZE: int = 5000  # Rows rolled up or deleted per transaction
+    COMPACTION_INTERVAL: float = 3600.0  # Seconds between compaction passes run by the API; 0 disables
+    COMPACTION_ARCHIVE_DIR: Optional[str] = os.getenv("COMPACTION_ARCHIVE_DIR")  # Archive deleted rows here as gzipped JSON lines
+    AGGREGATE_LAG: float = 300.0  # Rows younger than this wait for the next roll-up, so late commits aren't skipped
+    
+    # Price history built from price_aggregates
+    PRICE_ROLLUP_INTERVAL: float = 60.0  # Seconds between roll-ups of new results into price_aggregates; 0 disables
+    PRICE_HISTORY_DAYS: int = 90  # Default window for trends and deal signals
+    PRICE_DEAL_PERCENTILE: float = 20.0  # Prices at or below this historical percentile are a good deal
+    PRICE_EXPENSIVE_PERCENTILE: float = 80.0  # Prices above this historical percentile are expensive
+    PRICE_HISTORY_MIN_SAMPLES: int = 20  # Fewer historical prices than this give no deal signal
     
     # API Keys (you'll need to obtain these)
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     
     # Scraping settings
     SCRAPING_DELAY: float = 2.0  # Delay between requests in seconds
+    SCRAPING_BURST: int = 5  # Requests a domain may receive back-to-back before SCRAPING_DELAY applies
+    SCRAPING_RATES: Dict[str, float] = {}  # Per domain requests/second overrides, e.g. {"www.kayak.com.ar": 1.0}
+    SCRAPER_BASE_URLS: Dict[str, str] = {}  # Per site base URL overrides keyed on SITE_NAME, e.g. a local stand-in server for load tests
     MAX_RETRIES: int = 3
     REQUEST_TIMEOUT: int = 30
+    SCRAPER_MAX_PAGES: int = 3  # Result pages fetched per site and result type, for sites that paginate
+    SCRAPER_PAGE_CONCURRENCY: int = 2  # Pages of one site fetched at once by a search
+    SCRAPER_ENOUGH_RESULTS: int = 40  # Stop paging once this many of a site's results are within budget; 0 fetches every page
+
+    # HTML parsing
+    HTML_PARSER: Optional[str] = None  # BeautifulSoup parser; defaults to lxml when installed
+    PARSER_POOL: str = "process"  # "process", "thread" or "none" (parse on the event loop)
+    PARSER_POOL_SIZE: int = max(1, (os.cpu_count() or 2) - 1)
+
+    # Shared HTTP client settings
+    HTTP_POOL_LIMIT: int = 100  # Total open connections across all sites
+    HTTP_POOL_LIMIT_PER_HOST: int = 10  # Concurrent connections per target host
+    HTTP_DNS_CACHE_TTL: int = 300  # Seconds to cache DNS lookups
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0  # Seconds an idle connection is kept open
+
+    # Search result cache
+    CACHE_ENABLED: bool = True
+    CACHE_DEFAULT_TTL: int = 900  # Seconds
+    # Per result type ("flight") or per site and type ("Kayak:flight") overrides
+    CACHE_TTLS: Dict[str, int] = {"flight": 600, "accommodation": 1800}
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_SQLITE_PATH: Optional[str] = os.getenv("CACHE_SQLITE_PATH")
+    CACHE_STALE_TTL: int = 3600  # Seconds past TTL that results are still served while being refreshed
+
+    # Background refresh of hot searches
+    HOT_REFRESH_ENABLED: bool = True
+    HOT_REFRESH_INTERVAL: float = 60.0  # Seconds between refresh passes
+    HOT_REFRESH_TOP_N: int = 20  # Hottest searches kept warm
+    HOT_REFRESH_MARGIN: float = 120.0  # Refresh cache entries expiring within this many seconds
+    HOT_SEARCH_HALF_LIFE: float = 3600.0  # Seconds for a search's popularity to halve
+    HOT_SEARCH_WINDOW_HOURS: int = 24  # History read from the searches table at startup
+    HOT_SEARCH_MAX_TRACKED: int = 5000
+
+    # Search deadlines and hedged requests
+    SEARCH_DEADLINE: float = 20.0  # Seconds before a search returns partial results
+    SITE_DEADLINES: Dict[str, float] = {}  # Per site overrides, e.g. {"Kayak": 8.0}
+    HEDGE_ENABLED: bool = False  # Send a duplicate request when a site is slower than usual
+    HEDGE_PERCENTILE: float = 95.0  # Latency percentile after which to hedge
+    HEDGE_MIN_DELAY: float = 1.0  # Never hedge sooner than this many seconds
+    HEDGE_MIN_SAMPLES: int = 20  # Latency samples needed before hedging a site
+    LATENCY_WINDOW: int = 200  # Recent latency samples kept per site and result type
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # Serve Prometheus metrics at /metrics (unauthenticated; restrict at the proxy)
+    LOOP_LAG_INTERVAL: float = 0.5  # Seconds between event loop lag probes; 0 disables
+
+    # Circuit breaking of failing sites
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failed scrapes that open a site's circuit; 0 disables
+    CIRCUIT_EMPTY_IS_FAILURE: bool = True  # Count empty result pages (markup change, block page) as failures
+    CIRCUIT_COOLDOWN: float = 60.0  # Seconds a site is skipped before a probe scrape
+    CIRCUIT_MAX_COOLDOWN: float = 900.0  # Cap for the cool-down, which doubles after each failed probe
+
+    # Scrape job queue
+    JOB_BACKEND: str = "inline"  # "inline" scrapes inside the API process; "database" hands jobs to workers
+    JOB_WORKER_CONCURRENCY: int = 10  # Jobs a worker scrapes at once
+    EMBEDDED_WORKERS: int = 0  # Workers run inside the API process, for single-host deployments
+    JOB_POLL_INTERVAL: float = 0.5  # Seconds between queue polls when idle or waiting on jobs
+    JOB_VISIBILITY_TIMEOUT: float = 120.0  # Running jobs older than this are handed to another worker
+    JOB_MAX_ATTEMPTS: int = 2
+
+    # Ranking weights per result type; negative weights mean lower is better
+    RANKING_WEIGHTS: Dict[str, Dict[str, float]] = {
+        "default": {"price": -0.5, "rating": 0.3, "reviews_count": 0.2},
+        "flight": {"price": -0.5, "rating": 0.3, "reviews_count": 0.2},
+        "accommodation": {"price": -0.5, "rating": 0.3, "reviews_count": 0.2},
+    }
 
 settings = Settings()
\ No newline at end of file
@@ -1,9 +1,24 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+import asyncio
+import time
 from .config import settings
+from .services import metrics
 
-engine = create_engine(settings.DATABASE_URL)
+if settings.DATABASE_URL.startswith("sqlite"):
+    # Sessions are handed to the DB thread pool, so connections cross threads
+    engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+else:
+    # One pooled connection per DB worker thread, plus headroom for sync routes
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_THREAD_POOL_SIZE,
+        max_overflow=settings.DB_THREAD_POOL_SIZE
+    )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -12,4 +27,28 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Bounded pool that runs blocking Session work off the event loop
+db_executor = ThreadPoolExecutor(max_workers=settings.DB_THREAD_POOL_SIZE, thread_name_prefix="db")
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking database call in the DB thread pool and await its result.
+
+    A Session is not thread-safe, so callers must not run two calls for the
+    same session concurrently.
+    """
+    if not settings.DB_OFFLOAD:
+        return _timed(func, None, *args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(_timed, func, time.perf_counter(), *args, **kwargs))
+
+def _timed(func, queued: Optional[float], *args, **kwargs):
+    started = time.perf_counter()
+    if queued is not None:
+        metrics.db_wait_seconds.observe(started - queued)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # Histogram updates from DB threads are plain int/float adds, which the GIL keeps whole
+        metrics.db_call_seconds.labels(getattr(func, "__qualname__", "call")).observe(time.perf_counter() - started)
\ No newline at end of file
@@ -1,16 +1,73 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import search, auth, user
-from .database import engine, Base
+from .routers import search, auth, user, admin, prices, metrics
+from .database import db_executor
 from .config import settings
+from .scrapers.http_client import http_client
+from .scrapers.parsing import shutdown_parser_pool
+from .services.cache import search_cache
+from .services.result_writer import result_writer
+from .services.hot_searches import HotSearchRefresher
+from .services.retention import compactor
+from .services.passwords import password_hasher
+from .services.jobs import get_job_queue
+from .services.metrics import loop_lag_monitor, registry
+from .worker import ScrapeWorker
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+hot_search_refresher = HotSearchRefresher(search.search_service.refresh_hot_searches)
+
+# Scrape workers sharing this process, for deployments without separate worker processes
+job_queue = get_job_queue()
+embedded_workers = [
+    ScrapeWorker(job_queue, search.search_service)
+    for _ in range(settings.EMBEDDED_WORKERS if job_queue is not None else 0)
+]
+
+def embedded_worker_stats():
+    stats = [worker.stats() for worker in embedded_workers]
+    yield "worker_jobs_running", "gauge", "Scrape jobs running in embedded workers", [
+        ({"worker": s["worker"]}, s["running"]) for s in stats
+    ]
+    yield "worker_jobs_total", "counter", "Scrape jobs finished by embedded workers", [
+        ({"worker": s["worker"], "outcome": outcome}, s[key])
+        for s in stats for outcome, key in (("done", "jobs_done"), ("failed", "jobs_failed"))
+    ]
+
+if embedded_workers:
+    registry.register_collector(embedded_worker_stats)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client for every scraper, kept open for the app lifetime
+    await http_client.start()
+    await loop_lag_monitor.start()
+    await result_writer.start()
+    await hot_search_refresher.start()
+    await compactor.start()
+    for worker in embedded_workers:
+        await worker.start()
+    try:
+        yield
+    finally:
+        for worker in embedded_workers:
+            await worker.stop()
+        await compactor.stop()
+        await hot_search_refresher.stop()
+        # Flush queued results before the DB thread pool goes away
+        await result_writer.stop()
+        await http_client.close()
+        await loop_lag_monitor.stop()
+        shutdown_parser_pool()
+        password_hasher.shutdown()
+        search_cache.close()
+        db_executor.shutdown(wait=True)
 
 app = FastAPI(
     title="AI Travel Search API",
     description="An intelligent travel search engine that finds the best deals across multiple platforms",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -25,4 +82,8 @@ app.add_middleware(
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(user.router, prefix="/users", tags=["Users"])
-app.include_router(search.router, prefix="/search", tags=["Search"])
\ No newline at end of file
+app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(prices.router, prefix="/prices", tags=["Prices"])
+app.include_router(admin.router, prefix="/admin", tags=["Admin"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["Metrics"])
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -23,10 +23,18 @@ class Search(Base):
     guests = Column(Integer)
     budget = Column(Float)
     origin = Column(String, nullable=True)
+    status = Column(String, default="done")  # 'running' while a background search scrapes, then 'done' or 'failed'
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="searches")
     results = relationship("SearchResult", back_populates="search")
+    
+    __table_args__ = (
+        # A user's search history, newest first
+        Index("ix_searches_user_id_created_at", "user_id", "created_at"),
+        # Recent searches for a destination and travel date
+        Index("ix_searches_destination_start_date", "destination", "start_date"),
+    )
 
 class SearchResult(Base):
     __tablename__ = "search_results"
@@ -43,8 +51,65 @@ class SearchResult(Base):
     rating = Column(Float, nullable=True)
     reviews_count = Column(Integer, nullable=True)
     image_url = Column(String, nullable=True)
-    amenities = Column(String, nullable=True)
+    amenities = Column(JSON, nullable=True)
     location = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    search = relationship("Search", back_populates="results")
\ No newline at end of file
+    search = relationship("Search", back_populates="results")
+    
+    __table_args__ = (
+        # A search's results of one type, cheapest first; also serves lookups by search_id alone
+        Index("ix_search_results_search_id_type_price", "search_id", "type", "price"),
+        # Retention deletes old rows in created_at order
+        Index("ix_search_results_created_at", "created_at"),
+    )
+
+class ScrapeJob(Base):
+    __tablename__ = "scrape_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    search_id = Column(Integer, ForeignKey("searches.id"), index=True)
+    site = Column(String)
+    result_type = Column(String)  # 'flight' or 'accommodation'
+    params = Column(JSON)
+    status = Column(String, default="queued", index=True)  # 'queued', 'running', 'done' or 'failed'
+    attempts = Column(Integer, default=0)
+    worker = Column(String, nullable=True)
+    result_count = Column(Integer, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    search = relationship("Search")
+
+class PriceAggregate(Base):
+    """Daily price statistics per destination, site and result type, rolled up from search_results."""
+    __tablename__ = "price_aggregates"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    destination = Column(String)  # Normalized: lower case, single spaces
+    day = Column(Date)  # Day the prices were scraped
+    site = Column(String)
+    type = Column(String)
+    currency = Column(String)
+    count = Column(Integer)
+    min_price = Column(Float)
+    max_price = Column(Float)
+    sum_price = Column(Float)
+    median_price = Column(Float)
+    p90_price = Column(Float)
+    histogram = Column(JSON)  # {bucket: count} over log-spaced price buckets, so percentiles can be merged
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("uq_price_aggregates_key", "destination", "day", "site", "type", "currency", unique=True),
+    )
+
+class AggregationState(Base):
+    """How far search_results has been rolled up into price_aggregates."""
+    __tablename__ = "aggregation_state"
+    
+    name = Column(String, primary_key=True)
+    last_created_at = Column(DateTime, nullable=True)
+    last_id = Column(Integer, default=0)
\ No newline at end of file
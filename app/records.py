@@ -0,0 +1,127 @@
+"""
+The internal representation of one scraped result.
+
+Results are validated into ResultRecords once, where they leave the parser,
+and every later stage (cache, ranking, result writer, job queue, responses)
+passes the same objects along. Responses serialize records straight to JSON
+with dumps() rather than validating them again through the pydantic schemas.
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+from dataclasses import dataclass, fields
+from functools import partial
+import sys
+from pydantic_core import to_json
+
+# __slots__ keeps each record to a fixed-size object with no per-instance dict
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
+class ResultRecord:
+    site: str
+    type: str
+    price: float
+    currency: str
+    title: str
+    description: str
+    link: str
+    rating: Optional[float] = None
+    reviews_count: Optional[int] = None
+    image_url: Optional[str] = None
+    amenities: Optional[List[str]] = None
+    location: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ResultRecord":
+        """Validate a scraper's dict. Raises ValueError naming the first bad field."""
+        get = data.get
+        values = []
+        # Well-typed values, the usual case, are taken as they are
+        for name, check, kind in _VALIDATORS:
+            value = get(name)
+            values.append(value if type(value) in kind else check(data, name))
+        return cls(*values)
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "ResultRecord":
+        """A record from a stored search_results row, trusted as already validated."""
+        return cls(*(row[name] for name in RECORD_FIELDS))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in RECORD_FIELDS}
+
+RECORD_FIELDS = tuple(field.name for field in fields(ResultRecord))
+
+def _text(data: Mapping[str, Any], name: str, required: bool = True) -> Optional[str]:
+    value = data.get(name)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string, got {value!r}")
+    return value
+
+def _number(data: Mapping[str, Any], name: str, required: bool = True) -> Optional[float]:
+    value = data.get(name)
+    if value is None and not required:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+
+def _count(data: Mapping[str, Any], name: str) -> Optional[int]:
+    number = _number(data, name, required=False)
+    if number is None:
+        return None
+    if not number.is_integer():
+        raise ValueError(f"{name} must be a whole number, got {data[name]!r}")
+    return int(number)
+
+def _texts(data: Mapping[str, Any], name: str) -> Optional[List[str]]:
+    value = data.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{name} must be a list of strings, got {value!r}")
+    return list(value)
+
+# (field, validator, types accepted without calling the validator), in field order
+_VALIDATORS = (
+    ("site", _text, (str,)),
+    ("type", _text, (str,)),
+    ("price", _number, (float,)),
+    ("currency", _text, (str,)),
+    ("title", _text, (str,)),
+    ("description", _text, (str,)),
+    ("link", _text, (str,)),
+    ("rating", partial(_number, required=False), (float, type(None))),
+    ("reviews_count", _count, (int, type(None))),
+    ("image_url", partial(_text, required=False), (str, type(None))),
+    ("amenities", _texts, (type(None),)),
+    ("location", partial(_text, required=False), (str, type(None))),
+)
+
+def to_records(results: Iterable[Union[ResultRecord, Mapping[str, Any]]], site: str = "") -> List[ResultRecord]:
+    """
+    Records for a scraper's output. Records pass through untouched; dicts
+    (from scrapers that don't build records themselves) are validated, and
+    invalid ones are dropped with an error rather than failing the search.
+    """
+    records = []
+    for result in results:
+        if isinstance(result, ResultRecord):
+            records.append(result)
+            continue
+        try:
+            records.append(ResultRecord.from_dict(result))
+        except ValueError as e:
+            print(f"Error validating {site or result.get('site')} result: {e}")
+    return records
+
+def dumps(content: Any) -> bytes:
+    """
+    JSON for a response or stream event that may hold records and datetimes.
+    pydantic-core serializes dataclasses natively, without a schema to validate against.
+    """
+    return to_json(content)
\ No newline at end of file
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, Any
+from dataclasses import asdict
+from ..services.result_writer import result_writer
+from ..scrapers.throttle import domain_scheduler, request_coalescer
+from ..services.search_service import fan_out_plans, inflight_searches
+from ..services.circuit_breaker import circuit_breakers
+from ..services.passwords import password_hasher
+from ..services.tokens import token_cache
+from ..services.user_cache import user_cache
+from .auth import require_admin
+from .search import search_service
+
+# Only users listed in ADMIN_EMAILS; everyone else gets 403
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/result-writer")
+async def result_writer_stats() -> Dict[str, Any]:
+    """
+    Queue depth and flush latency of the write-behind result writer.
+    """
+    return result_writer.stats()
+
+@router.get("/scraping")
+async def scraping_stats() -> Dict[str, Any]:
+    """
+    Per-domain rate limiter queue waits, request coalescing, search
+    deduplication counters and how many scraper calls searches planned or skipped.
+    """
+    return {
+        "domains": domain_scheduler.stats(),
+        "coalescing": request_coalescer.stats(),
+        "search_deduplication": inflight_searches.stats(),
+        "fan_out_plan": fan_out_plans.stats()
+    }
+
+@router.get("/scrapers")
+async def scraper_capabilities() -> Dict[str, Any]:
+    """
+    What each scraper can search: result types, required search params,
+    regions and currencies. Searches only call scrapers that can serve them.
+    """
+    return {
+        scraper.SITE_NAME: {
+            result_type: asdict(capability)
+            for result_type, capability in scraper.capabilities().items()
+        }
+        for scraper in search_service.scrapers
+    }
+
+@router.get("/auth")
+async def auth_stats() -> Dict[str, Any]:
+    """
+    Hit rates of the verified-token and user caches used by authentication,
+    and queueing in the password hashing pool.
+    """
+    return {"tokens": token_cache.stats(), "users": user_cache.stats(), "password_hashing": password_hasher.stats()}
+
+@router.get("/circuits")
+async def circuit_stats() -> Dict[str, Any]:
+    """
+    Circuit breaker state per site: closed (scraped normally), open (skipped
+    until the cool-down passes) or half_open (one probe scrape in flight).
+    """
+    return {"enabled": circuit_breakers.enabled, "sites": circuit_breakers.stats()}
+
+@router.post("/circuits/{site}/reset")
+async def reset_circuit(site: str) -> Dict[str, Any]:
+    """
+    Close a site's circuit so it is scraped again straight away, e.g. after
+    fixing its listing spec.
+    """
+    if not circuit_breakers.reset(site):
+        raise HTTPException(status_code=404, detail="No circuit for this site")
+    return circuit_breakers.get(site).stats()
\ No newline at end of file
@@ -1,66 +1,108 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from ..database import get_db
+from ..config import settings
+from ..database import get_db, run_db
 from ..models import User
 from ..schemas import Token, TokenData, UserCreate, User as UserSchema
-from ..config import settings
+from ..services.passwords import HasherBusy, password_hasher
+from ..services.tokens import InvalidTokenError, encode_token, token_cache
+from ..services.user_cache import AuthenticatedUser, user_cache
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many password checks in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+async def verify_password(plain_password: str, hashed_password: str):
+    """(valid, new hash), the new hash being set when the stored one should be upgraded."""
+    try:
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+    except HasherBusy:
+        raise hasher_busy()
 
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
+async def get_password_hash(password: str):
+    try:
+        return await password_hasher.hash(password)
+    except HasherBusy:
+        raise hasher_busy()
 
 def create_access_token(data: dict):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    return encode_token(data)
+
+def user_claims(user: User) -> dict:
+    # uid and active let requests authenticate without reading the users table
+    return {"sub": user.email, "uid": user.id, "active": bool(user.is_active)}
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-):
+) -> AuthenticatedUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = token_cache.verify(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
         token_data = TokenData(email=email)
-    except JWTError:
+    except InvalidTokenError:
+        raise credentials_exception
+    if payload.get("active") is False:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user_id = payload.get("uid")
+    user = user_cache.get(user_id) if user_id is not None else None
     if user is None:
+        # Cache miss, or a token issued before uid was added to the claims
+        query = db.query(User).filter(User.id == user_id) if user_id is not None else db.query(User).filter(User.email == token_data.email)
+        db_user = await run_db(lambda: query.first())
+        if db_user is None:
+            raise credentials_exception
+        user = AuthenticatedUser.from_model(db_user)
+        user_cache.set(user)
+    if not user.is_active or user.email != token_data.email:
         raise credentials_exception
     return user
 
+async def require_admin(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
+    if current_user.email not in settings.ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    def find_user():
+        user = db.query(User).filter(User.email == form_data.username).first()
+        # Hand the connection back to the pool rather than holding it open through the hash check
+        db.close()
+        return user
+
+    user = await run_db(find_user)
+    valid, new_hash = await verify_password(form_data.password, user.hashed_password) if user else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash is not None:
+        # Stored with an older BCRYPT_ROUNDS
+        def save_hash():
+            db.query(User).filter(User.id == user.id).update({User.hashed_password: new_hash})
+            db.commit()
+        await run_db(save_hash)
     
-    access_token = create_access_token(data={"sub": user.email})
+    access_token = create_access_token(data=user_claims(user))
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
@@ -0,0 +1,88 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from typing import Iterator
+from ..services import metrics
+from ..services.metrics import Family, registry
+from ..services.cache import search_cache
+from ..services.result_writer import result_writer
+from ..scrapers.throttle import domain_scheduler, request_coalescer
+from ..services.search_service import fan_out_plans, inflight_searches
+from ..services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, circuit_breakers
+from ..services.passwords import password_hasher
+from ..services.tokens import token_cache
+from ..services.user_cache import user_cache
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics() -> PlainTextResponse:
+    """
+    Scraping, parsing, database, ranking and search latencies plus event loop
+    lag, in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+def _service_stats() -> Iterator[Family]:
+    # Counters and gauges the services already keep for the /admin endpoints
+    writer = result_writer.stats()
+    yield "result_writer_queue_depth", "gauge", "Result rows waiting to be written", [({}, writer["queue_depth"])]
+    yield "result_writer_rows_total", "counter", "Result rows written or dropped after a failed flush", [
+        ({"outcome": "written"}, writer["rows_written"]),
+        ({"outcome": "failed"}, writer["rows_failed"]),
+    ]
+
+    domains = domain_scheduler.stats()
+    yield "scraper_rate_limit_waiting", "gauge", "Fetches waiting for a domain's rate limit", [
+        ({"domain": domain}, stats["waiting"]) for domain, stats in domains.items()
+    ]
+    yield "scraper_rate_limit_wait_seconds_total", "counter", "Time fetches spent waiting for a domain's rate limit", [
+        ({"domain": domain}, stats["total_wait_seconds"]) for domain, stats in domains.items()
+    ]
+
+    for name, flight in (("fetch", request_coalescer), ("search", inflight_searches)):
+        stats = flight.stats()
+        yield f"{name}_deduplication_total", "counter", f"Identical in-flight {name}es started or joined", [
+            ({"outcome": "started"}, stats["started"]),
+            ({"outcome": "joined"}, stats["joined"]),
+        ]
+
+    plans = fan_out_plans.stats()
+    yield "fan_out_planned_calls_total", "counter", "Scraper calls planned by searches", [({}, plans["planned_calls"])]
+    yield "fan_out_skipped_calls_total", "counter", "Scraper calls skipped because the scraper can't serve the search", [
+        ({}, plans["skipped_calls"])
+    ]
+
+    yield "search_cache_lookups_total", "counter", "Search cache lookups by outcome", [
+        ({"outcome": "hit"}, search_cache.hits),
+        ({"outcome": "stale"}, search_cache.stale_hits),
+        ({"outcome": "miss"}, search_cache.misses),
+    ]
+    for name, cache in (("token", token_cache), ("user", user_cache)):
+        stats = cache.stats()
+        yield f"{name}_cache_lookups_total", "counter", f"Auth {name} cache lookups by outcome", [
+            ({"outcome": "hit"}, stats["hits"]),
+            ({"outcome": "miss"}, stats["misses"]),
+        ]
+
+    hashing = password_hasher.stats()
+    yield "password_hash_pending", "gauge", "Password hashes queued or running", [({}, hashing["pending"])]
+    yield "password_hash_rejected_total", "counter", "Password hashes rejected because the queue was full", [
+        ({}, hashing["rejected"])
+    ]
+
+    circuits = circuit_breakers.stats()
+    yield "circuit_state", "gauge", "1 for each site's current circuit state", [
+        ({"site": site, "state": state}, int(stats["state"] == state))
+        for site, stats in circuits.items() for state in (CLOSED, OPEN, HALF_OPEN)
+    ]
+    yield "circuit_rejected_total", "counter", "Scrapes skipped because the site's circuit was open", [
+        ({"site": site}, stats["rejected"]) for site, stats in circuits.items()
+    ]
+
+    yield "event_loop_last_lag_seconds", "gauge", "Lag seen by the latest event loop probe", [
+        ({}, metrics.loop_lag_monitor.last_lag)
+    ]
+
+registry.register_collector(_service_stats)
\ No newline at end of file
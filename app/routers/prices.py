@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Dict, Any, Literal, Optional
+from ..database import run_db
+from ..services import price_history
+from .auth import get_current_user
+
+router = APIRouter(dependencies=[Depends(get_current_user)])
+
+@router.get("/trends")
+async def price_trends(
+    destination: str,
+    type: Literal["flight", "accommodation"] = "accommodation",
+    site: Optional[str] = None,
+    days: Optional[int] = Query(None, ge=1, le=730),
+    period: Literal["day", "week"] = "day"
+) -> Dict[str, Any]:
+    """
+    Historical price statistics for a destination, per day or week, from the
+    price aggregates rather than raw results.
+    """
+    frame = await run_db(price_history.load_aggregates, destination, type, site, days)
+    return {
+        "destination": price_history.normalize_destination(destination),
+        "type": type,
+        "site": site,
+        "period": period,
+        "points": price_history.trend(frame, period)
+    }
+
+@router.get("/deal")
+async def price_deal(
+    destination: str,
+    price: float = Query(..., gt=0),
+    type: Literal["flight", "accommodation"] = "accommodation",
+    site: Optional[str] = None,
+    days: Optional[int] = Query(None, ge=1, le=730)
+) -> Dict[str, Any]:
+    """
+    Whether a price is a good deal compared with the prices seen for this
+    destination over the last `days` days.
+    """
+    frame = await run_db(price_history.load_aggregates, destination, type, site, days)
+    return {
+        "destination": price_history.normalize_destination(destination),
+        "type": type,
+        "site": site,
+        **price_history.deal_signal(frame, price)
+    }
@@ -1,30 +1,162 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
-from ..database import get_db
-from ..schemas import SearchCreate, SearchResponse
+from typing import Any, List, Literal, Optional
+from ..database import get_db, run_db, SessionLocal
+from ..records import dumps
+from ..schemas import SearchCreate, SearchResponse, SearchAccepted, SearchDetail, SearchSummary, SearchResultsPage, SearchJobStatus
 from ..services.search_service import SearchService
+from ..services.jobs import get_job_queue
 from .auth import get_current_user
-from ..models import User
+from ..models import Search
+from ..services.user_cache import AuthenticatedUser
 
 router = APIRouter()
 search_service = SearchService()
 
-@router.post("/", response_model=SearchResponse)
+class RecordJSONResponse(JSONResponse):
+    """
+    Serializes result records directly. Returning a Response skips FastAPI's
+    response_model validation; records were validated when they were scraped.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+@router.post("/", response_model=SearchResponse, responses={202: {"model": SearchAccepted}})
 async def search_travel(
     search: SearchCreate,
+    wait: bool = True,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[AuthenticatedUser] = Depends(get_current_user)
 ):
     """
     Search for travel options across multiple platforms.
+    
+    With wait=false, respond 202 with the search id straight away and keep
+    scraping in the background; fetch the outcome from GET /search/{id}. With
+    a job queue configured, follow the workers' progress per site at
+    GET /search/jobs/{id} or stream it from GET /search/jobs/{id}/stream.
     """
     try:
         search_params = search.model_dump()
         if current_user:
             search_params["user_id"] = current_user.id
         
+        if not wait:
+            accepted = await search_service.start_search(db, search_params)
+            return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=jsonable_encoder(accepted))
+        
         results = await search_service.search_all(db, search_params)
-        return results
+        return RecordJSONResponse(results)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def get_owned_search(
+    search_id: int,
+    db: Session = Depends(get_db),
+    current_user: Optional[AuthenticatedUser] = Depends(get_current_user)
+) -> Search:
+    search = await run_db(search_service.get_search, db, search_id)
+    # Other users' searches are reported as missing rather than forbidden
+    if search is None or (search.user_id is not None and (current_user is None or search.user_id != current_user.id)):
+        raise HTTPException(status_code=404, detail="Search not found")
+    return search
+
+@router.get("/", response_model=List[SearchSummary])
+async def search_history(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    The current user's searches, newest first.
+    """
+    return await run_db(search_service.history, db, current_user.id, limit, offset)
+
+@router.get("/{search_id}", response_model=SearchDetail)
+async def get_search(
+    search: Search = Depends(get_owned_search),
+    db: Session = Depends(get_db)
+):
+    """
+    A stored search: its status, how many results were found and the best options.
+    """
+    return RecordJSONResponse(await search_service.search_details(db, search))
+
+@router.get("/{search_id}/results", response_model=SearchResultsPage)
+async def get_search_results(
+    search_id: int,
+    type: Optional[Literal["flight", "accommodation"]] = None,
+    site: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    search: Search = Depends(get_owned_search),
+    db: Session = Depends(get_db)
+):
+    """
+    A page of a search's stored results, cheapest first, optionally filtered
+    by result type and site.
+    """
+    return RecordJSONResponse(await run_db(search_service.results_page, db, search_id, type, site, limit, offset))
+
+@router.post("/stream")
+async def search_travel_stream(
+    search: SearchCreate,
+    current_user: Optional[AuthenticatedUser] = Depends(get_current_user)
+):
+    """
+    Search for travel options, streaming results as NDJSON as soon as each
+    result page is parsed, followed by a final "done" event.
+    """
+    search_params = search.model_dump()
+    if current_user:
+        search_params["user_id"] = current_user.id
+    
+    async def event_stream():
+        # Dependencies are torn down before a streaming body runs, so the
+        # stream owns its own session
+        db = SessionLocal()
+        try:
+            async for event in search_service.search_stream(db, search_params):
+                yield dumps(event) + b"\n"
+        except Exception as e:
+            yield dumps({"event": "error", "detail": str(e)}) + b"\n"
+        finally:
+            db.close()
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+def require_job_queue():
+    if get_job_queue() is None:
+        raise HTTPException(status_code=503, detail="Queued searches need a JOB_BACKEND other than inline")
+
+@router.get("/jobs/{search_id}", response_model=SearchJobStatus, dependencies=[Depends(require_job_queue), Depends(get_owned_search)])
+async def search_job_status(search_id: int):
+    """
+    Progress of a queued search, per site and result type.
+    """
+    job_status = await search_service.job_status(search_id)
+    if job_status is None:
+        raise HTTPException(status_code=404, detail="Search not found")
+    return job_status
+
+@router.get("/jobs/{search_id}/stream", dependencies=[Depends(require_job_queue), Depends(get_owned_search)])
+async def search_job_stream(search_id: int):
+    """
+    Stream a queued search's results as NDJSON as workers finish each site,
+    with the same events as POST /search/stream.
+    """
+    if await search_service.job_status(search_id) is None:
+        raise HTTPException(status_code=404, detail="Search not found")
+    
+    async def event_stream():
+        try:
+            async for event in search_service.follow_jobs(search_id):
+                yield dumps(event) + b"\n"
+        except Exception as e:
+            yield dumps({"event": "error", "detail": str(e)}) + b"\n"
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
\ No newline at end of file
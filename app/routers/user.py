@@ -1,27 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_db, run_db
 from ..schemas import UserCreate, User
 from ..models import User as UserModel
+from ..services.user_cache import AuthenticatedUser
 from .auth import get_password_hash, get_current_user
 
 router = APIRouter()
 
 @router.post("/", response_model=User)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(UserModel).filter(UserModel.email == user.email).first()
+async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_db(lambda: db.query(UserModel).filter(UserModel.email == user.email).first())
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     db_user = UserModel(email=user.email, hashed_password=hashed_password)
     
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    def save():
+        db.add(db_user)
+        db.commit()
+        db.refresh(db_user)
+    await run_db(save)
     
     return db_user
 
 @router.get("/me", response_model=User)
-async def read_users_me(current_user: UserModel = Depends(get_current_user)):
+async def read_users_me(current_user: AuthenticatedUser = Depends(get_current_user)):
     return current_user
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -24,7 +24,9 @@ class SearchBase(BaseModel):
     origin: Optional[str] = None
 
 class SearchCreate(SearchBase):
-    pass
+    # When set, only sites that serve the destination's country and quote this currency are scraped
+    country: Optional[str] = Field(None, min_length=2, max_length=2)  # ISO 3166-1 alpha-2 code of the destination
+    currency: Optional[str] = Field(None, min_length=3, max_length=3)  # ISO 4217 code
 
 class SearchResult(BaseModel):
     site: str
@@ -37,7 +39,7 @@ class SearchResult(BaseModel):
     rating: Optional[float] = None
     reviews_count: Optional[int] = None
     image_url: Optional[str] = None
-    amenities: Optional[str] = None
+    amenities: Optional[List[str]] = None
     location: Optional[str] = None
 
 class SearchResponse(BaseModel):
@@ -47,11 +49,61 @@ class SearchResponse(BaseModel):
     all_flights: List[SearchResult]
     all_accommodations: List[SearchResult]
     total_found: int
+    timed_out_sites: List[str] = []
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class ScrapeJob(BaseModel):
+    id: int
+    site: str
+    type: str
+    status: str
+    attempts: int
+    result_count: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class SearchJobStatus(BaseModel):
+    id: int
+    status: str
+    jobs: List[ScrapeJob]
+    total_found: int
+
+class SearchAccepted(BaseModel):
+    id: int
+    status: str
+    created_at: datetime
+
+class SearchSummary(SearchBase):
+    id: int
+    status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SearchDetail(SearchBase):
+    id: int
+    status: str
+    created_at: datetime
+    total_found: int
+    flights_found: int
+    accommodations_found: int
+    best_flight: Optional[SearchResult] = None
+    best_accommodation: Optional[SearchResult] = None
+    jobs: Optional[List[ScrapeJob]] = None
+
+class SearchResultsPage(BaseModel):
+    search_id: int
+    total: int
+    limit: int
+    offset: int
+    results: List[SearchResult]
+
 class Token(BaseModel):
     access_token: str
     token_type: str
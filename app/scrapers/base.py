@@ -1,49 +1,126 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import aiohttp
 from fake_useragent import UserAgent
 from bs4 import BeautifulSoup
 from ..config import settings
+from ..records import ResultRecord
+from ..services import metrics
+from .http_client import http_client
+from .throttle import domain_scheduler, request_coalescer
 import asyncio
+import time
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+RESULT_TYPES = ("accommodation", "flight")
+
+# Set by a caller that wants each result page as soon as it is parsed, e.g. a
+# streaming search: called with (site, result type, the page's new results)
+page_sink: ContextVar[Optional[Callable[[str, str, List[ResultRecord]], None]]] = ContextVar("page_sink", default=None)
+
+def _count_retry(retry_state):
+    # tenacity hook, called before sleeping between attempts; args[0] is the scraper
+    metrics.fetch_retries.labels(retry_state.args[0].SITE_NAME).inc()
+
+@dataclass(frozen=True)
+class Capability:
+    """What a scraper can search for one result type."""
+    result_type: str
+    requires: Tuple[str, ...] = ()  # Search params that must be set, e.g. origin for flights
+    regions: Optional[Tuple[str, ...]] = None  # ISO country codes of destinations served; None means anywhere
+    currencies: Tuple[str, ...] = ()  # Currencies prices are quoted in; empty when unknown
+
 class BaseScraper(ABC):
+    BASE_URL: str = ""
+    SITE_NAME: str = ""
+    REGIONS: Optional[Tuple[str, ...]] = None
+
     def __init__(self):
         self.user_agent = UserAgent()
-        self.session = None
     
-    async def get_session(self):
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-        return self.session
+    @property
+    def base_url(self) -> str:
+        """Where pages are fetched from: BASE_URL unless SCRAPER_BASE_URLS points this site elsewhere."""
+        return settings.SCRAPER_BASE_URLS.get(self.SITE_NAME, self.BASE_URL)
+    
+    def capabilities(self) -> Dict[str, Capability]:
+        """
+        Result types this scraper can return, keyed by type. The search service
+        plans its fan-out from these, so a scraper is never called for a type
+        it doesn't offer or without the params it needs.
+        """
+        return {result_type: Capability(result_type, regions=self.REGIONS) for result_type in RESULT_TYPES}
+    
+    def skip_reason(self, result_type: str, params: Dict[str, Any]) -> Optional[str]:
+        """Why this scraper can't produce results of result_type for params, or None if it can."""
+        capability = self.capabilities().get(result_type)
+        if capability is None:
+            return "unsupported"
+        missing = [name for name in capability.requires if not params.get(name)]
+        if missing:
+            return f"missing {', '.join(missing)}"
+        country = (params.get("country") or "").upper()
+        if country and capability.regions is not None and country not in capability.regions:
+            return f"doesn't serve {country}"
+        currency = (params.get("currency") or "").upper()
+        if currency and capability.currencies and currency not in capability.currencies:
+            return f"no prices in {currency}"
+        return None
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        # Borrow the shared, pooled session instead of owning one per scraper
+        return await http_client.get_session()
+    
+    async def fetch_page(self, url: str, params: Dict[str, Any] = None) -> str:
+        # Concurrent searches asking for the same page share one outbound request
+        key = request_coalescer.key(url, params)
+        return await request_coalescer.run(key, lambda: self._fetch_with_retry(url, params))
     
     @retry(
         stop=stop_after_attempt(settings.MAX_RETRIES),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        before_sleep=_count_retry
     )
-    async def fetch_page(self, url: str, params: Dict[str, Any] = None) -> str:
+    async def _fetch_with_retry(self, url: str, params: Dict[str, Any] = None) -> str:
+        # Every attempt, retries included, waits for the target domain's rate limit
+        await domain_scheduler.acquire(url)
         session = await self.get_session()
         headers = {"User-Agent": self.user_agent.random}
         
-        async with session.get(
-            url,
-            params=params,
-            headers=headers,
-            timeout=settings.REQUEST_TIMEOUT
-        ) as response:
-            if response.status == 200:
+        # Timed from the request going out, so rate-limit waits don't count as fetch time
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            async with session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=settings.REQUEST_TIMEOUT
+            ) as response:
+                if response.status != 200:
+                    outcome = str(response.status)
+                    raise Exception(f"Failed to fetch {url}: {response.status}")
+                body = await response.read()
+                outcome = "ok"
+                metrics.fetch_bytes.labels(self.SITE_NAME).inc(len(body))
                 return await response.text()
-            raise Exception(f"Failed to fetch {url}: {response.status}")
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            metrics.fetch_seconds.labels(self.SITE_NAME, outcome).observe(time.perf_counter() - started)
     
+    # Plain SearchResult-shaped dicts are accepted too; they are validated into records by the search service
     @abstractmethod
-    async def search_flights(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def search_flights(self, params: Dict[str, Any]) -> List[ResultRecord]:
         pass
     
     @abstractmethod
-    async def search_accommodations(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def search_accommodations(self, params: Dict[str, Any]) -> List[ResultRecord]:
         pass
     
     async def close(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
\ No newline at end of file
+        # The shared session is closed by the application lifespan, not per search
+        pass
\ No newline at end of file
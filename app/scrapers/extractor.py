@@ -0,0 +1,286 @@
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+from functools import lru_cache
+from urllib.parse import urljoin
+import asyncio
+import re
+import time
+import soupsieve
+from bs4 import SoupStrainer
+from ..config import settings
+from ..records import ResultRecord
+from ..services import metrics
+from .base import BaseScraper, Capability, page_sink
+from .parsing import make_soup, run_parser
+
+_NUMBER = re.compile(r"\d[\d.,]*\d|\d")
+_DECIMAL = re.compile(r"\d+(?:[.,]\d+)?")
+
+def parse_price(text: str, locale: str = "es") -> Optional[float]:
+    """
+    Parse the first amount in a price label.
+
+    locale is the site's number format: "es" for 1.234,56 and "en" for
+    1,234.56. It only decides genuinely ambiguous amounts such as "1.234"
+    or "1,234"; "1.234,56", "1,234.56", "12,5" and "1.234.567" parse the
+    same under either locale.
+    """
+    match = _NUMBER.search(text or "")
+    if match is None:
+        return None
+    number = match.group()
+    thousands = "." if locale == "es" else ","
+
+    last_dot, last_comma = number.rfind("."), number.rfind(",")
+    if last_dot >= 0 and last_comma >= 0:
+        # Both separators: whichever comes last is the decimal point
+        decimal = "." if last_dot > last_comma else ","
+    elif last_dot >= 0 or last_comma >= 0:
+        separator = "." if last_dot >= 0 else ","
+        fraction = number.rsplit(separator, 1)[1]
+        if number.count(separator) > 1:
+            decimal = None
+        elif len(fraction) != 3:
+            decimal = separator
+        else:
+            decimal = None if separator == thousands else separator
+    else:
+        decimal = None
+
+    if decimal is None:
+        return float(number.replace(".", "").replace(",", ""))
+    whole, fraction = number.rsplit(decimal, 1)
+    return float(whole.replace(".", "").replace(",", "") + "." + fraction)
+
+def parse_rating(text: str) -> Optional[float]:
+    """First number in a rating label: "8.5", "4,9 (120)", "8/10"."""
+    match = _DECIMAL.search(text or "")
+    return float(match.group().replace(",", ".")) if match else None
+
+@dataclass(frozen=True)
+class Field:
+    """How to read one value out of a listing container."""
+    selector: Optional[str] = None  # None reads the container itself
+    attr: Optional[str] = None  # Read this attribute instead of the text
+    kind: str = "text"  # "text", "price", "rating", "url" or "list" (text of every match)
+    required: bool = True
+
+@dataclass(frozen=True)
+class ListingSpec:
+    """
+    Everything needed to fetch and extract one result type from one site.
+
+    path and query values are str.format templates over the search params,
+    e.g. "/hotels/{destination}" or "{start_date:%Y-%m-%d}". title and
+    description are templates over the extracted field names.
+    """
+    result_type: str
+    path: str
+    query: Dict[str, str]
+    container: str
+    fields: Dict[str, Field]
+    title: str = "{title}"
+    description: str = "{title}"
+    price_locale: str = "es"
+    currency: str = "USD"
+    requires: Tuple[str, ...] = ()
+    strainer: Optional[SoupStrainer] = field(default=None, compare=False)
+    page_param: Optional[str] = None  # Query param selecting a result page; None fetches the first page only
+    page_start: int = 1  # page_param value of the second page is page_start + page_step
+    page_step: int = 1  # 1 for page numbers, the page size for offsets
+
+    def build_path(self, params: Dict[str, Any]) -> str:
+        return self.path.format(**params)
+
+    def build_query(self, params: Dict[str, Any], page: int = 0) -> Dict[str, str]:
+        query = {name: template.format(**params) for name, template in self.query.items()}
+        # The first page keeps the plain URL, so it caches and coalesces as before
+        if page and self.page_param:
+            query[self.page_param] = str(self.page_start + page * self.page_step)
+        return query
+
+# Extracted fields copied onto the record as-is when a spec defines them
+OPTIONAL_FIELDS = ("image_url", "rating", "reviews_count", "location", "amenities")
+
+_ATTR_EQUALS = re.compile(r'^\[([\w-]+)="([^"]+)"\]$')
+_CLASS_CONTAINS = re.compile(r'^\[class\*="([^"]+)"\]$')
+_CLASS = re.compile(r"^\.([\w-]+)$")
+
+def strainer_for(selector: str) -> Optional[SoupStrainer]:
+    """Derive a SoupStrainer for simple container selectors so only listings are parsed."""
+    match = _ATTR_EQUALS.match(selector)
+    if match:
+        return SoupStrainer(attrs={match.group(1): match.group(2)})
+    match = _CLASS_CONTAINS.match(selector)
+    if match:
+        return SoupStrainer(class_=re.compile(re.escape(match.group(1))))
+    match = _CLASS.match(selector)
+    if match:
+        return SoupStrainer(class_=match.group(1))
+    return None
+
+@lru_cache(maxsize=None)
+def compiled(selector: str) -> soupsieve.SoupSieve:
+    # Selectors are compiled once per process, not on every select() call
+    return soupsieve.compile(selector)
+
+def _read(container, spec_field: Field, base_url: str, locale: str):
+    if spec_field.kind == "list":
+        elements = compiled(spec_field.selector).select(container)
+        return [element.get_text(strip=True) for element in elements] or None
+    element = compiled(spec_field.selector).select_one(container) if spec_field.selector else container
+    if element is None:
+        return None
+    raw = element.get(spec_field.attr) if spec_field.attr else element.get_text(strip=True)
+    if raw is None:
+        return None
+    if spec_field.kind == "price":
+        return parse_price(raw, locale)
+    if spec_field.kind == "rating":
+        return parse_rating(raw)
+    if spec_field.kind == "url":
+        return urljoin(base_url, raw)
+    return raw
+
+def extract(spec: ListingSpec, html: str, base_url: str, site: str) -> List[ResultRecord]:
+    """Parse a result page once and turn every listing container into a validated ResultRecord."""
+    return extract_with_errors(spec, html, base_url, site)[0]
+
+def extract_with_errors(spec: ListingSpec, html: str, base_url: str, site: str) -> Tuple[List[ResultRecord], int]:
+    """
+    extract(), also counting the listings dropped as invalid. The count is
+    returned rather than recorded here because this may run in a parser process.
+    """
+    soup = make_soup(html, spec.strainer or strainer_for(spec.container))
+    results = []
+    errors = 0
+
+    for container in compiled(spec.container).select(soup):
+        values = {name: _read(container, spec_field, base_url, spec.price_locale) for name, spec_field in spec.fields.items()}
+        missing = [name for name, spec_field in spec.fields.items() if spec_field.required and values[name] is None]
+        if missing:
+            print(f"Error parsing {site} {spec.result_type}: missing {', '.join(missing)}")
+            errors += 1
+            continue
+
+        record = {
+            "site": site,
+            "type": spec.result_type,
+            "title": spec.title.format(**values),
+            "price": values["price"],
+            "currency": spec.currency,
+            "link": values.get("link"),
+            "description": spec.description.format(**values),
+        }
+        for name in OPTIONAL_FIELDS:
+            if name in values:
+                record[name] = values[name]
+        try:
+            results.append(ResultRecord.from_dict(record))
+        except ValueError as e:
+            print(f"Error parsing {site} {spec.result_type}: {e}")
+            errors += 1
+
+    return results, errors
+
+class SpecScraper(BaseScraper):
+    """
+    A scraper defined entirely by ListingSpecs. Adding a site means
+    subclassing this with BASE_URL, SITE_NAME and a spec per result type.
+    """
+    ACCOMMODATIONS: Optional[ListingSpec] = None
+    FLIGHTS: Optional[ListingSpec] = None
+
+    def spec_for(self, result_type: str) -> Optional[ListingSpec]:
+        return self.FLIGHTS if result_type == "flight" else self.ACCOMMODATIONS
+
+    def capabilities(self) -> Dict[str, Capability]:
+        return {
+            spec.result_type: Capability(spec.result_type, spec.requires, self.REGIONS, (spec.currency,))
+            for spec in (self.ACCOMMODATIONS, self.FLIGHTS) if spec is not None
+        }
+
+    async def search(self, result_type: str, params: Dict[str, Any]) -> List[ResultRecord]:
+        results = []
+        sink = page_sink.get()
+        async for page in self.search_pages(result_type, params):
+            results.extend(page)
+            if sink is not None:
+                sink(self.SITE_NAME, result_type, page)
+        return results
+
+    async def search_pages(self, result_type: str, params: Dict[str, Any]) -> AsyncIterator[List[ResultRecord]]:
+        """
+        Yield each result page's new listings as soon as it is parsed. Up to
+        SCRAPER_MAX_PAGES pages are fetched, SCRAPER_PAGE_CONCURRENCY at a time,
+        stopping at the first empty page or once SCRAPER_ENOUGH_RESULTS
+        listings are within the search budget.
+        """
+        spec = self.spec_for(result_type)
+        if spec is None or any(not params.get(name) for name in spec.requires):
+            return
+
+        url = f"{self.base_url}{spec.build_path(params)}"
+        last_page = max(1, settings.SCRAPER_MAX_PAGES) if spec.page_param else 1
+        budget = params.get("budget")
+        seen = set()
+        within_budget = 0
+        next_page = 0
+        fetched = 0
+        pending: Dict[asyncio.Task, int] = {}
+        try:
+            while True:
+                while next_page < last_page and len(pending) < max(1, settings.SCRAPER_PAGE_CONCURRENCY):
+                    pending[asyncio.ensure_future(self._page(spec, url, params, next_page))] = next_page
+                    next_page += 1
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page = pending.pop(task)
+                    if task.exception() is not None:
+                        # Without the first page there is nothing to show; later pages are a bonus
+                        if page == 0:
+                            raise task.exception()
+                        print(f"Error fetching {self.SITE_NAME} {result_type} page {page + 1}: {task.exception()!r}")
+                        continue
+                    fetched += 1
+                    records = task.result()
+                    if not records:
+                        # Past the last page; don't ask for more
+                        last_page = min(last_page, page)
+                        continue
+                    # Sponsored listings repeat across pages
+                    fresh = []
+                    for record in records:
+                        if record.link not in seen:
+                            seen.add(record.link)
+                            fresh.append(record)
+                            if budget is None or record.price <= budget:
+                                within_budget += 1
+                    if fresh:
+                        yield fresh
+                if settings.SCRAPER_ENOUGH_RESULTS and within_budget >= settings.SCRAPER_ENOUGH_RESULTS:
+                    if pending or next_page < last_page:
+                        metrics.early_stops.labels(self.SITE_NAME, result_type).inc()
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            metrics.pages_fetched.labels(self.SITE_NAME, result_type).observe(fetched)
+
+    async def _page(self, spec: ListingSpec, url: str, params: Dict[str, Any], page: int) -> List[ResultRecord]:
+        html = await self.fetch_page(url, params=spec.build_query(params, page))
+        started = time.perf_counter()
+        results, errors = await run_parser(extract_with_errors, spec, html, self.BASE_URL, self.SITE_NAME)
+        metrics.parse_seconds.labels(self.SITE_NAME, spec.result_type).observe(time.perf_counter() - started)
+        metrics.items_extracted.labels(self.SITE_NAME, spec.result_type).observe(len(results))
+        if errors:
+            metrics.parse_errors.labels(self.SITE_NAME, spec.result_type).inc(errors)
+        return results
+
+    async def search_accommodations(self, params: Dict[str, Any]) -> List[ResultRecord]:
+        return await self.search("accommodation", params)
+
+    async def search_flights(self, params: Dict[str, Any]) -> List[ResultRecord]:
+        return await self.search("flight", params)
\ No newline at end of file
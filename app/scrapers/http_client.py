@@ -0,0 +1,43 @@
+from typing import Optional
+import aiohttp
+from ..config import settings
+
+class HTTPClient:
+    """Process-wide aiohttp session shared by every scraper.
+
+    The session owns a single pooled connector, so keep-alive connections and
+    cached DNS lookups survive across searches. Scrapers borrow the session and
+    must never close it; the application lifespan does that on shutdown.
+    """
+
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=settings.REQUEST_TIMEOUT),
+        )
+
+    async def start(self):
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        # Lazily start for callers running outside the app lifespan (scripts, shells)
+        if self.session is None or self.session.closed:
+            await self.start()
+        return self.session
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+http_client = HTTPClient()
\ No newline at end of file
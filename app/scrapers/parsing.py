@@ -0,0 +1,54 @@
+from typing import Callable, Optional, TypeVar
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import asyncio
+import multiprocessing
+from bs4 import BeautifulSoup, SoupStrainer
+from ..config import settings
+
+T = TypeVar("T")
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_HTML_PARSER = "lxml"
+except ImportError:
+    DEFAULT_HTML_PARSER = "html.parser"
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse a page with the fastest available parser. parse_only restricts the
+    tree to the listing containers, skipping scripts, navigation and footers.
+    """
+    return BeautifulSoup(html, settings.HTML_PARSER or DEFAULT_HTML_PARSER, parse_only=parse_only)
+
+_pool: Optional[Executor] = None
+
+def get_parser_pool() -> Optional[Executor]:
+    global _pool
+    if _pool is None and settings.PARSER_POOL != "none":
+        if settings.PARSER_POOL == "process":
+            # spawn, not fork: the parent runs an event loop and thread pools
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PARSER_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _pool = ThreadPoolExecutor(max_workers=settings.PARSER_POOL_SIZE, thread_name_prefix="parser")
+    return _pool
+
+async def run_parser(func: Callable[..., T], *args) -> T:
+    """
+    Run a page parser off the event loop. With the process pool, func and its
+    arguments must be picklable (module-level functions or classmethods).
+    """
+    pool = get_parser_pool()
+    if pool is None:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, partial(func, *args))
+
+def shutdown_parser_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
\ No newline at end of file
@@ -0,0 +1,101 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+import asyncio
+import time
+from ..config import settings
+from ..services.singleflight import SingleFlight
+
+# Set for hedged duplicate requests, which must not join the request they duplicate
+coalescing_disabled: ContextVar[bool] = ContextVar("coalescing_disabled", default=False)
+
+class TokenBucket:
+    """
+    Token bucket allowing `burst` back-to-back requests, refilled at `rate`
+    tokens per second. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        started = time.monotonic()
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+        return time.monotonic() - started
+
+class DomainScheduler:
+    """Per-domain politeness: one token bucket per target host."""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def rate_for(domain: str) -> float:
+        # SCRAPING_DELAY is the steady-state gap between requests to one domain
+        return settings.SCRAPING_RATES.get(domain, 1 / settings.SCRAPING_DELAY if settings.SCRAPING_DELAY > 0 else float("inf"))
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = self._buckets[domain] = TokenBucket(self.rate_for(domain), settings.SCRAPING_BURST)
+            self._stats[domain] = {"requests": 0, "waiting": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+        return bucket
+
+    async def acquire(self, url: str) -> float:
+        domain = urlsplit(url).netloc
+        bucket = self._bucket(domain)
+        stats = self._stats[domain]
+        if bucket.rate == float("inf"):
+            stats["requests"] += 1
+            return 0.0
+
+        stats["waiting"] += 1
+        try:
+            waited = await bucket.acquire()
+        finally:
+            stats["waiting"] -= 1
+        stats["requests"] += 1
+        stats["total_wait_seconds"] += waited
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            domain: {
+                **stats,
+                "rate_per_second": self._buckets[domain].rate,
+                "avg_wait_seconds": stats["total_wait_seconds"] / stats["requests"] if stats["requests"] else 0.0,
+            }
+            for domain, stats in self._stats.items()
+        }
+
+class RequestCoalescer(SingleFlight):
+    """Identical in-flight fetches share one outbound request."""
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        return (url, tuple(sorted((params or {}).items())))
+
+    async def run(self, key: Tuple, factory: Callable[[], Awaitable[Any]]) -> Any:
+        if coalescing_disabled.get():
+            return await factory()
+        return await self.do(key, factory)
+
+domain_scheduler = DomainScheduler()
+request_coalescer = RequestCoalescer()
\ No newline at end of file
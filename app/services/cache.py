@@ -0,0 +1,166 @@
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, date
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from ..config import settings
+from ..records import ResultRecord, dumps, to_records
+
+def normalize_search_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce SearchCreate fields to the values that change scraper output."""
+    def _day(value):
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+        return str(value)[:10]
+
+    origin = params.get("origin")
+    return {
+        "destination": " ".join(params["destination"].split()).lower(),
+        "origin": " ".join(origin.split()).lower() if origin else None,
+        "start_date": _day(params["start_date"]),
+        "end_date": _day(params["end_date"]),
+        "guests": int(params["guests"]),
+        "budget": round(float(params["budget"]), 2),
+    }
+
+def search_key(params: Dict[str, Any]) -> str:
+    normalized = json.dumps(normalize_search_params(params), sort_keys=True)
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+class SQLiteCacheStore:
+    """Optional on-disk backing so cached results survive restarts and are
+    shared between workers on the same host."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, List[ResultRecord]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], to_records(json.loads(row[1]))
+
+    def set(self, key: str, expires_at: float, value: List[ResultRecord]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, expires_at, dumps(value).decode()),
+            )
+            self._conn.execute(
+                "DELETE FROM search_cache WHERE expires_at < ?",
+                (time.time() - settings.CACHE_STALE_TTL,)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class SearchCache:
+    """LRU cache of scraper output keyed on (search key, site, result type).
+
+    Entries live in memory up to CACHE_MAX_ENTRIES and, when CACHE_SQLITE_PATH
+    is set, are written through to SQLite and read back on a memory miss.
+    After their TTL, entries stay servable as stale for CACHE_STALE_TTL so
+    callers can answer immediately and refresh in the background.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, Tuple[float, List[ResultRecord]]]" = OrderedDict()
+        self._store: Optional[SQLiteCacheStore] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @property
+    def store(self) -> Optional[SQLiteCacheStore]:
+        if self._store is None and settings.CACHE_SQLITE_PATH:
+            self._store = SQLiteCacheStore(settings.CACHE_SQLITE_PATH)
+        return self._store
+
+    @staticmethod
+    def ttl_for(site: str, result_type: str) -> int:
+        ttls = settings.CACHE_TTLS
+        return ttls.get(f"{site}:{result_type}", ttls.get(result_type, settings.CACHE_DEFAULT_TTL))
+
+    @staticmethod
+    def _entry_key(key: str, site: str, result_type: str) -> str:
+        return f"{key}:{site}:{result_type}"
+
+    def _remember(self, entry_key: str, expires_at: float, value: List[ResultRecord]):
+        self._entries[entry_key] = (expires_at, value)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > settings.CACHE_MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    async def lookup(self, key: str, site: str, result_type: str) -> Tuple[Optional[List[ResultRecord]], bool]:
+        """Return (value, stale). value is None on a miss or once the stale window has passed."""
+        if not settings.CACHE_ENABLED:
+            return None, False
+
+        entry_key = self._entry_key(key, site, result_type)
+        entry = self._entries.get(entry_key)
+        if entry is None and self.store is not None:
+            entry = await asyncio.to_thread(self.store.get, entry_key)
+            if entry is not None:
+                self._remember(entry_key, *entry)
+
+        now = time.time()
+        if entry is None or entry[0] + settings.CACHE_STALE_TTL < now:
+            self._entries.pop(entry_key, None)
+            self.misses += 1
+            return None, False
+
+        self._entries.move_to_end(entry_key)
+        stale = entry[0] < now
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return entry[1], stale
+
+    async def get(self, key: str, site: str, result_type: str) -> Optional[List[ResultRecord]]:
+        """Fresh entries only."""
+        value, stale = await self.lookup(key, site, result_type)
+        return None if stale else value
+
+    def expires_in(self, key: str, site: str, result_type: str) -> Optional[float]:
+        """Seconds until an in-memory entry goes stale (negative once it has), None if absent."""
+        entry = self._entries.get(self._entry_key(key, site, result_type))
+        return entry[0] - time.time() if entry is not None else None
+
+    async def set(self, key: str, site: str, result_type: str, value: List[ResultRecord]):
+        if not settings.CACHE_ENABLED:
+            return
+
+        entry_key = self._entry_key(key, site, result_type)
+        expires_at = time.time() + self.ttl_for(site, result_type)
+        self._remember(entry_key, expires_at, value)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.set, entry_key, expires_at, value)
+
+    def clear(self):
+        self._entries.clear()
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+search_cache = SearchCache()
\ No newline at end of file
@@ -0,0 +1,130 @@
+from typing import Any, Dict, Optional
+import time
+from ..config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """The site's circuit is open, so it isn't scraped until its cool-down passes."""
+
+class CircuitBreaker:
+    """
+    Tracks one site's recent scrapes. After CIRCUIT_FAILURE_THRESHOLD
+    consecutive failures (errors, or empty result pages when
+    CIRCUIT_EMPTY_IS_FAILURE is set) the circuit opens and the site is skipped
+    for a cool-down. Then one probe scrape is let through (half-open): success
+    closes the circuit, failure re-opens it with the cool-down doubled, up to
+    CIRCUIT_MAX_COOLDOWN.
+    """
+
+    def __init__(self, site: str):
+        self.site = site
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.cooldown = settings.CIRCUIT_COOLDOWN
+        self.probing = False
+        self.times_opened = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+    def _cooled_down(self) -> bool:
+        return self.opened_at is not None and time.monotonic() - self.opened_at >= self.cooldown
+
+    def available(self) -> bool:
+        """Whether a scrape would be let through now, without taking the probe slot."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return self._cooled_down()
+        return not self.probing
+
+    def acquire(self):
+        """Permission for one scrape. Raises CircuitOpenError while the site is being skipped."""
+        if self.state == OPEN and self._cooled_down():
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return
+        if self.state == HALF_OPEN and not self.probing:
+            self.probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(f"{self.site} circuit is {self.state}")
+
+    def release(self):
+        """A permitted scrape ended without a verdict (cancelled)."""
+        self.probing = False
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.cooldown = settings.CIRCUIT_COOLDOWN
+        self.probing = False
+
+    def record_failure(self, error: str):
+        self.failures += 1
+        self.last_error = error
+        if self.state == HALF_OPEN:
+            # The probe failed; back off further before the next one
+            self.cooldown = min(self.cooldown * 2, settings.CIRCUIT_MAX_COOLDOWN)
+            self._open()
+        elif self.state == CLOSED and self.failures >= settings.CIRCUIT_FAILURE_THRESHOLD:
+            self._open()
+        self.probing = False
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def reset(self):
+        self.record_success()
+        self.last_error = None
+
+    def stats(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "cooldown_seconds": self.cooldown,
+            "retry_in_seconds": retry_in,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
+
+class CircuitBreakers:
+    """One CircuitBreaker per site, created on first use."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.CIRCUIT_FAILURE_THRESHOLD > 0
+
+    def get(self, site: str) -> CircuitBreaker:
+        breaker = self._breakers.get(site)
+        if breaker is None:
+            breaker = self._breakers[site] = CircuitBreaker(site)
+        return breaker
+
+    def available(self, site: str) -> bool:
+        return not self.enabled or self.get(site).available()
+
+    def reset(self, site: Optional[str] = None) -> int:
+        """Close one site's circuit, or every circuit. Returns how many were reset."""
+        breakers = [self._breakers[site]] if site in self._breakers else [] if site else list(self._breakers.values())
+        for breaker in breakers:
+            breaker.reset()
+        return len(breakers)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {site: breaker.stats() for site, breaker in self._breakers.items()}
+
+circuit_breakers = CircuitBreakers()
\ No newline at end of file
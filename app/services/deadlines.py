@@ -0,0 +1,72 @@
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from collections import defaultdict, deque
+import asyncio
+from ..config import settings
+from ..scrapers.throttle import coalescing_disabled
+
+T = TypeVar("T")
+
+def site_deadline(site: str) -> float:
+    """Seconds a single site may take, never more than the whole search."""
+    return min(settings.SITE_DEADLINES.get(site, settings.SEARCH_DEADLINE), settings.SEARCH_DEADLINE)
+
+class LatencyTracker:
+    """Rolling window of recent scrape latencies per site and result type."""
+
+    def __init__(self):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=settings.LATENCY_WINDOW))
+
+    def record(self, key: str, seconds: float):
+        self._samples[key].append(seconds)
+
+    def percentile(self, key: str, pct: float) -> Optional[float]:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < settings.HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        if not settings.HEDGE_ENABLED:
+            return None
+        delay = self.percentile(key, settings.HEDGE_PERCENTILE)
+        if delay is None:
+            return None
+        return max(delay, settings.HEDGE_MIN_DELAY)
+
+latency_tracker = LatencyTracker()
+
+async def hedged(factory: Callable[[], Awaitable[T]], delay: Optional[float]) -> T:
+    """
+    Await factory(), and if it hasn't finished after `delay` seconds start a
+    duplicate and return whichever succeeds first. The loser is cancelled.
+    """
+    first = asyncio.ensure_future(factory())
+    pending = {first}
+    try:
+        # Cancelling the caller (e.g. a deadline) cancels every attempt still running
+        if delay is None:
+            return await first
+
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return first.result()
+
+        # The duplicate must go out as a new request rather than join the slow one
+        token = coalescing_disabled.set(True)
+        try:
+            pending.add(asyncio.ensure_future(factory()))
+        finally:
+            coalescing_disabled.reset(token)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
\ No newline at end of file
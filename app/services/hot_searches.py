@@ -0,0 +1,125 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import time
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import SessionLocal, run_db
+from ..models import Search
+from .cache import search_key
+
+logger = logging.getLogger(__name__)
+
+# Search params that determine what gets scraped
+SEARCH_FIELDS = ("destination", "start_date", "end_date", "guests", "budget", "origin")
+
+class HotSearchTracker:
+    """
+    Exponentially decayed popularity counter per normalized search.
+
+    Each search adds 1 to its key's score and scores halve every
+    HOT_SEARCH_HALF_LIFE seconds, so the top keys are the ones searched
+    most in the recent past.
+    """
+
+    def __init__(self):
+        # key -> (score, last update as unix time, search params)
+        self._scores: Dict[str, Tuple[float, float, Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _decay(score: float, elapsed: float) -> float:
+        return score * 0.5 ** (max(0.0, elapsed) / settings.HOT_SEARCH_HALF_LIFE)
+
+    def record(self, search_params: Dict[str, Any], at: Optional[float] = None, weight: float = 1.0):
+        at = time.time() if at is None else at
+        key = search_key(search_params)
+        score, updated, _ = self._scores.get(key, (0.0, at, None))
+        params = {field: search_params.get(field) for field in SEARCH_FIELDS}
+        self._scores[key] = (self._decay(score, at - updated) + weight, max(at, updated), params)
+        if len(self._scores) > settings.HOT_SEARCH_MAX_TRACKED:
+            self._prune()
+
+    def _prune(self):
+        now = time.time()
+        ranked = sorted(self._scores.items(), key=lambda item: self._decay(item[1][0], now - item[1][1]), reverse=True)
+        self._scores = dict(ranked[:settings.HOT_SEARCH_MAX_TRACKED])
+
+    def top(self, n: int) -> List[Tuple[str, Dict[str, Any], float]]:
+        """The n hottest searches that still have future travel dates, hottest first."""
+        now = time.time()
+        today = datetime.utcnow().date()
+        candidates = []
+        for key, (score, updated, params) in self._scores.items():
+            start_date = params["start_date"]
+            if isinstance(start_date, datetime) and start_date.date() < today:
+                continue
+            candidates.append((key, params, self._decay(score, now - updated)))
+        candidates.sort(key=lambda item: item[2], reverse=True)
+        return candidates[:n]
+
+    def seed(self, db: Session):
+        """Warm the counters from recent rows in the searches table."""
+        since = datetime.utcnow() - timedelta(hours=settings.HOT_SEARCH_WINDOW_HOURS)
+        rows = (
+            db.query(Search)
+            .filter(Search.created_at >= since)
+            .order_by(Search.created_at.desc(), Search.id.desc())
+            .limit(settings.HOT_SEARCH_MAX_TRACKED * 10)
+            .all()
+        )
+        # Keep the newest rows, which have decayed least, and record them oldest first
+        for row in reversed(rows):
+            created_at = row.created_at.replace(tzinfo=None)
+            at = time.time() - (datetime.utcnow() - created_at).total_seconds()
+            self.record({field: getattr(row, field) for field in SEARCH_FIELDS}, at=at)
+
+hot_searches = HotSearchTracker()
+
+class HotSearchRefresher:
+    """
+    Background loop, run inside the app, that re-scrapes the hottest searches
+    shortly before their cached results expire.
+    """
+
+    def __init__(self, refresh: Callable[[List[Dict[str, Any]]], Awaitable[int]]):
+        self._refresh = refresh
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if not settings.HOT_REFRESH_ENABLED or self._task is not None:
+            return
+
+        def seed():
+            db = SessionLocal()
+            try:
+                hot_searches.seed(db)
+            finally:
+                db.close()
+
+        try:
+            await run_db(seed)
+        except Exception:
+            logger.exception("Could not seed hot searches from the searches table")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.HOT_REFRESH_INTERVAL)
+            try:
+                hot = [params for _, params, _ in hot_searches.top(settings.HOT_REFRESH_TOP_N)]
+                refreshed = await self._refresh(hot)
+                if refreshed:
+                    logger.info("Refreshed %d cached scrapes for %d hot searches", refreshed, len(hot))
+            except Exception:
+                logger.exception("Hot search refresh failed")
\ No newline at end of file
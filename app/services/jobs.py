@@ -0,0 +1,254 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, exists, insert, or_, select, update
+from ..config import settings
+from ..database import engine
+from ..models import ScrapeJob, Search, SearchResult
+from ..records import ResultRecord
+from .result_writer import RESULT_COLUMNS, ResultWriter
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED = (DONE, FAILED)
+
+# Error recorded for jobs that ran past their site deadline
+TIMEOUT_ERROR = "timeout"
+# Error recorded for jobs skipped because the site's circuit breaker is open
+CIRCUIT_OPEN_ERROR = "circuit open"
+
+# Search params stored as ISO strings that scrapers expect as datetimes
+DATE_FIELDS = ("start_date", "end_date")
+
+@dataclass
+class ClaimedJob:
+    id: int
+    search_id: int
+    site: str
+    result_type: str
+    params: Dict[str, Any]
+    attempt: int
+
+def encode_params(search_params: Dict[str, Any]) -> Dict[str, Any]:
+    return jsonable_encoder(search_params)
+
+def decode_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    decoded = dict(params)
+    for field in DATE_FIELDS:
+        if isinstance(decoded.get(field), str):
+            decoded[field] = datetime.fromisoformat(decoded[field])
+    return decoded
+
+def search_status(jobs: List[Dict[str, Any]]) -> str:
+    """Overall status of a search from its jobs' statuses."""
+    statuses = {job["status"] for job in jobs}
+    if statuses <= set(FINISHED):
+        return DONE
+    if statuses == {QUEUED}:
+        return QUEUED
+    return RUNNING
+
+class JobQueue(ABC):
+    """
+    Queue of per-site scrape jobs shared by the API and worker processes.
+
+    Methods are blocking; async callers run them through run_db. Workers
+    claim jobs, scrape, and report back with complete() or fail(). A job a
+    worker claimed but never reported on is handed out again after
+    JOB_VISIBILITY_TIMEOUT, up to JOB_MAX_ATTEMPTS times. Whichever call
+    finishes a search's last job also sets the search's status to "done".
+    """
+
+    @abstractmethod
+    def enqueue(self, search_id: int, search_params: Dict[str, Any], plan: Sequence[Tuple[str, str]]):
+        """Queue one job per (site, result type) in plan."""
+
+    @abstractmethod
+    def claim(self, worker: str, limit: int) -> List[ClaimedJob]:
+        pass
+
+    @abstractmethod
+    def complete(self, job: ClaimedJob, results: List[ResultRecord]) -> bool:
+        """Store a job's results. False if the job was meanwhile handed to another worker."""
+
+    @abstractmethod
+    def fail(self, job: ClaimedJob, error: str, retry: bool = True) -> bool:
+        pass
+
+    @abstractmethod
+    def release(self, jobs: Sequence[ClaimedJob]):
+        """Put claimed jobs back without counting the attempt, e.g. on worker shutdown."""
+
+    @abstractmethod
+    def jobs(self, search_id: int) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def results(self, search_id: int, site: Optional[str] = None, result_type: Optional[str] = None) -> List[ResultRecord]:
+        pass
+
+class DatabaseJobQueue(JobQueue):
+    """
+    Job queue kept in the scrape_jobs table, so it needs nothing beyond the
+    app database. Results go straight into search_results.
+
+    On PostgreSQL workers claim with FOR UPDATE SKIP LOCKED. Every claim also
+    bumps the attempt counter and only succeeds if the counter is unchanged,
+    which keeps claims exclusive on databases without row locks (SQLite).
+    """
+
+    table = ScrapeJob.__table__
+
+    def _owned(self, job: ClaimedJob):
+        return and_(self.table.c.id == job.id, self.table.c.status == RUNNING, self.table.c.attempts == job.attempt)
+
+    def _finish_search(self, conn, search_id: int):
+        # Called in the transaction that finished one of the search's jobs, so
+        # whichever worker finishes the last job marks the search done
+        unfinished = exists().where(and_(self.table.c.search_id == search_id, self.table.c.status.not_in(FINISHED)))
+        conn.execute(update(Search.__table__).where(Search.id == search_id, ~unfinished).values(status=DONE))
+
+    def enqueue(self, search_id: int, search_params: Dict[str, Any], plan: Sequence[Tuple[str, str]]):
+        if not plan:
+            return
+        params = encode_params(search_params)
+        created_at = datetime.utcnow()
+        with engine.begin() as conn:
+            conn.execute(insert(self.table), [
+                {
+                    "search_id": search_id,
+                    "site": site,
+                    "result_type": result_type,
+                    "params": params,
+                    "status": QUEUED,
+                    "attempts": 0,
+                    "created_at": created_at
+                }
+                for site, result_type in plan
+            ])
+
+    def claim(self, worker: str, limit: int) -> List[ClaimedJob]:
+        if limit <= 0:
+            return []
+        now = datetime.utcnow()
+        abandoned = and_(
+            self.table.c.status == RUNNING,
+            self.table.c.started_at < now - timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT)
+        )
+        query = (
+            select(self.table)
+            .where(or_(self.table.c.status == QUEUED, abandoned))
+            .order_by(self.table.c.id)
+            .limit(limit)
+        )
+        if engine.dialect.name == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+
+        claimed = []
+        with engine.begin() as conn:
+            for row in conn.execute(query).mappings().all():
+                unchanged = and_(self.table.c.id == row["id"], self.table.c.attempts == row["attempts"])
+                if row["attempts"] >= settings.JOB_MAX_ATTEMPTS:
+                    # Abandoned by every worker that tried it
+                    conn.execute(update(self.table).where(unchanged).values(
+                        status=FAILED, error="worker lost", finished_at=now
+                    ))
+                    self._finish_search(conn, row["search_id"])
+                    continue
+                updated = conn.execute(update(self.table).where(unchanged).values(
+                    status=RUNNING, attempts=row["attempts"] + 1, worker=worker, started_at=now
+                )).rowcount
+                if updated:
+                    claimed.append(ClaimedJob(
+                        id=row["id"],
+                        search_id=row["search_id"],
+                        site=row["site"],
+                        result_type=row["result_type"],
+                        params=decode_params(row["params"]),
+                        attempt=row["attempts"] + 1
+                    ))
+        return claimed
+
+    def complete(self, job: ClaimedJob, results: List[ResultRecord]) -> bool:
+        with engine.begin() as conn:
+            updated = conn.execute(update(self.table).where(self._owned(job)).values(
+                status=DONE, result_count=len(results), error=None, finished_at=datetime.utcnow()
+            )).rowcount
+            if updated and results:
+                conn.execute(insert(SearchResult.__table__), ResultWriter.to_rows(job.search_id, results))
+            if updated:
+                self._finish_search(conn, job.search_id)
+        return bool(updated)
+
+    def fail(self, job: ClaimedJob, error: str, retry: bool = True) -> bool:
+        if retry and job.attempt < settings.JOB_MAX_ATTEMPTS:
+            values = {"status": QUEUED, "error": error, "started_at": None}
+        else:
+            values = {"status": FAILED, "error": error, "finished_at": datetime.utcnow()}
+        with engine.begin() as conn:
+            updated = conn.execute(update(self.table).where(self._owned(job)).values(**values)).rowcount
+            if updated and values["status"] == FAILED:
+                self._finish_search(conn, job.search_id)
+        return bool(updated)
+
+    def release(self, jobs: Sequence[ClaimedJob]):
+        with engine.begin() as conn:
+            for job in jobs:
+                conn.execute(update(self.table).where(self._owned(job)).values(
+                    status=QUEUED, attempts=job.attempt - 1, worker=None, started_at=None
+                ))
+
+    def jobs(self, search_id: int) -> List[Dict[str, Any]]:
+        query = (
+            select(
+                self.table.c.id,
+                self.table.c.site,
+                self.table.c.result_type.label("type"),
+                self.table.c.status,
+                self.table.c.attempts,
+                self.table.c.result_count,
+                self.table.c.error,
+                self.table.c.created_at,
+                self.table.c.started_at,
+                self.table.c.finished_at
+            )
+            .where(self.table.c.search_id == search_id)
+            .order_by(self.table.c.id)
+        )
+        with engine.connect() as conn:
+            return [dict(row) for row in conn.execute(query).mappings()]
+
+    def results(self, search_id: int, site: Optional[str] = None, result_type: Optional[str] = None) -> List[ResultRecord]:
+        table = SearchResult.__table__
+        query = select(*(table.c[column] for column in RESULT_COLUMNS)).where(table.c.search_id == search_id)
+        if site is not None:
+            query = query.where(table.c.site == site)
+        if result_type is not None:
+            query = query.where(table.c.type == result_type)
+        with engine.connect() as conn:
+            return [ResultRecord.from_row(row) for row in conn.execute(query.order_by(table.c.id)).mappings()]
+
+# JOB_BACKEND name -> factory. "inline" means no queue: the API process scrapes itself.
+JOB_BACKENDS: Dict[str, Callable[[], JobQueue]] = {
+    "database": DatabaseJobQueue,
+}
+
+def register_job_backend(name: str, factory: Callable[[], JobQueue]):
+    JOB_BACKENDS[name] = factory
+
+_job_queue: Optional[JobQueue] = None
+
+def get_job_queue() -> Optional[JobQueue]:
+    """The configured job queue, or None when JOB_BACKEND is "inline"."""
+    global _job_queue
+    if settings.JOB_BACKEND == "inline":
+        return None
+    if _job_queue is None:
+        if settings.JOB_BACKEND not in JOB_BACKENDS:
+            raise ValueError(f"Unknown JOB_BACKEND {settings.JOB_BACKEND!r}")
+        _job_queue = JOB_BACKENDS[settings.JOB_BACKEND]()
+    return _job_queue
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""
+In-process metrics in the Prometheus text format, served at /metrics.
+
+Hot paths only touch Counter and Histogram children: a dict lookup for the
+label values, then an integer increment or a bisect into the bucket bounds,
+so instrumentation can stay on in production. Stats the services already
+keep (queue depths, cache hits, breaker states) are not copied here; they
+are read through collectors when /metrics is scraped.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+import asyncio
+import math
+import time
+from ..config import settings
+
+# Seconds; fine enough to tell a 50 ms cache hit from a 20 s scrape
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+SIZE_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+Labels = Tuple[str, ...]
+# (name, type, help, [(label names and values, value)])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._children: Dict[Labels, Any] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}, got {values}")
+            child = self._children[values] = self._child()
+        return child
+
+    @abstractmethod
+    def _child(self):
+        """A new child holding one label combination's value."""
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        pass
+
+    def _labels(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.label_names, values))
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}_total{_format_labels(self._labels(values))} {_format_value(child.value)}" for values, child in self._children.items()]
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        # bisect_left puts a value equal to a bound in that bound's bucket (le is inclusive)
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = []
+        for values, child in self._children.items():
+            labels = self._labels(values)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(float(bound))})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {child.count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def _add(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]):
+        """Add a function producing metric families from existing stats when /metrics is scraped."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            name = f"{metric.name}_total" if metric.kind == "counter" else metric.name
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, kind, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(float(value))}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# Scraping, per site
+fetch_seconds = registry.histogram("scraper_fetch_seconds", "Time of one HTTP fetch attempt", ("site", "outcome"))
+fetch_bytes = registry.counter("scraper_fetch_bytes", "Response bytes downloaded", ("site",))
+fetch_retries = registry.counter("scraper_fetch_retries", "Fetch attempts retried after a failure", ("site",))
+parse_seconds = registry.histogram("scraper_parse_seconds", "Time to parse a result page, including the wait for a parser worker", ("site", "type"))
+items_extracted = registry.histogram("scraper_items_extracted", "Results extracted from one page", ("site", "type"), SIZE_BUCKETS)
+parse_errors = registry.counter("scraper_parse_errors", "Listings dropped for missing or invalid fields", ("site", "type"))
+pages_fetched = registry.histogram("scraper_pages_fetched", "Result pages fetched for one search", ("site", "type"), (0, 1, 2, 3, 5, 10))
+early_stops = registry.counter("scraper_early_stops", "Searches that stopped paging once enough results were within budget", ("site", "type"))
+scrape_seconds = registry.histogram("scrape_seconds", "Time to get one site's results for a search, from cache or live", ("site", "type", "outcome"))
+
+# Search pipeline
+search_seconds = registry.histogram("search_seconds", "End-to-end time of a search", ("mode",))
+ranking_seconds = registry.histogram("ranking_seconds", "Time to rank one result type of a search", ("type",))
+db_call_seconds = registry.histogram("db_call_seconds", "Time of a blocking database call in the DB thread pool", ("call",))
+db_wait_seconds = registry.histogram("db_wait_seconds", "Time a database call queued for a DB thread")
+event_loop_lag = registry.histogram("event_loop_lag_seconds", "How late the event loop woke a sleeping task")
+
+class LoopLagMonitor:
+    """Background task that sleeps LOOP_LAG_INTERVAL at a time and records how late it wakes."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.last_lag = 0.0
+
+    async def start(self):
+        if self._task is None and settings.LOOP_LAG_INTERVAL > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        interval = settings.LOOP_LAG_INTERVAL
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            self.last_lag = max(0.0, time.perf_counter() - expected)
+            event_loop_lag.observe(self.last_lag)
+
+loop_lag_monitor = LoopLagMonitor()
\ No newline at end of file
@@ -0,0 +1,108 @@
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asyncio
+import os
+import threading
+import time
+from passlib.context import CryptContext
+from ..config import settings
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+class HasherBusy(Exception):
+    """PASSWORD_HASH_MAX_PENDING calls are already queued or running."""
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a small dedicated thread pool so logins never stall the
+    event loop (bcrypt releases the GIL while hashing). At most
+    PASSWORD_HASH_MAX_PENDING calls may be queued or running; beyond that
+    callers get HasherBusy instead of an ever longer queue.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_hash_seconds = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="bcrypt",
+                initializer=self._lower_priority
+            )
+        return self._executor
+
+    @staticmethod
+    def _lower_priority():
+        # On Linux a thread has its own nice value, so the event loop thread
+        # keeps winning the CPU while hashing threads are runnable
+        if settings.PASSWORD_HASH_NICE and hasattr(os, "setpriority") and hasattr(threading, "get_native_id"):
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), settings.PASSWORD_HASH_NICE)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _timed(submitted: float, func: Callable[..., T], *args) -> Tuple[T, float, float]:
+        """Result, seconds spent queued and seconds spent hashing."""
+        started = time.perf_counter()
+        result = func(*args)
+        return result, started - submitted, time.perf_counter() - started
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if settings.PASSWORD_HASH_WORKERS <= 0:
+            # Inline on the event loop; only sensible for tests and benchmarks
+            return func(*args)
+        if self.pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            self.rejected += 1
+            raise HasherBusy()
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited, took = await loop.run_in_executor(self.executor, partial(self._timed, time.perf_counter(), func, *args))
+        finally:
+            self.pending -= 1
+        # Counted here, on the event loop, rather than in the worker threads
+        self.completed += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.total_hash_seconds += took
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self.run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new hash) where the new hash is set when the stored one uses outdated settings."""
+        return await self.run(pwd_context.verify_and_update, password, hashed)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            "pending": self.pending,
+            "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": self.total_wait_seconds / self.completed if self.completed else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+            "avg_hash_seconds": self.total_hash_seconds / self.completed if self.completed else 0.0,
+        }
+
+password_hasher = PasswordHasher()
\ No newline at end of file
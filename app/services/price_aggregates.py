@@ -0,0 +1,191 @@
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import math
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from ..config import settings
+from ..database import engine
+from ..models import AggregationState, PriceAggregate, Search, SearchResult
+
+# Prices are counted in log-spaced buckets 5% wide, so percentiles of merged
+# days or batches stay within 2.5% of the exact value
+BUCKET_RATIO = 1.05
+_LOG_RATIO = math.log(BUCKET_RATIO)
+
+KEY_COLUMNS = ["destination", "day", "site", "type", "currency"]
+STATE_NAME = "search_results"
+
+def bucket_of(prices: np.ndarray) -> np.ndarray:
+    return np.floor(np.log(prices) / _LOG_RATIO).astype(np.int64)
+
+def histogram_percentile(histogram: Dict[str, int], q: float, low: float, high: float) -> float:
+    """
+    Approximate q-quantile (0..1) from bucket counts, interpolated log-linearly
+    within the bucket and clamped to the exact min and max.
+    """
+    target = q * sum(histogram.values())
+    seen = 0
+    for bucket in sorted(histogram, key=int):
+        count = histogram[bucket]
+        if seen + count >= target:
+            value = BUCKET_RATIO ** (int(bucket) + (target - seen) / count)
+            return min(max(value, low), high)
+        seen += count
+    return high
+
+def summarize(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Roll raw result rows (destination, created_at, site, type, currency, price)
+    up to one row of mergeable stats per aggregate key.
+    """
+    rows = rows[rows["price"].notna() & (rows["price"] > 0)].copy()
+    if rows.empty:
+        return pd.DataFrame(columns=KEY_COLUMNS + ["count", "min_price", "max_price", "sum_price", "histogram"])
+    rows["destination"] = rows["destination"].fillna("").str.split().str.join(" ").str.lower()
+    rows["currency"] = rows["currency"].fillna("")
+    rows["day"] = pd.to_datetime(rows["created_at"]).dt.date
+    rows["bucket"] = bucket_of(rows["price"].to_numpy(dtype=np.float64))
+
+    grouped = rows.groupby(KEY_COLUMNS, sort=False)
+    stats = grouped["price"].agg(count="count", min_price="min", max_price="max", sum_price="sum")
+    buckets = rows.groupby(KEY_COLUMNS + ["bucket"], sort=False).size()
+    histograms: Dict[Tuple, Dict[str, int]] = {}
+    for (*key, bucket), count in buckets.items():
+        histograms.setdefault(tuple(key), {})[str(bucket)] = int(count)
+    stats["histogram"] = [histograms[key] for key in stats.index]
+    return stats.reset_index()
+
+def merge(conn: Connection, stats: pd.DataFrame) -> int:
+    """Add summarized stats into price_aggregates, creating rows for new keys. Returns rows touched."""
+    if stats.empty:
+        return 0
+    table = PriceAggregate.__table__
+    existing = {
+        tuple(row[column] for column in KEY_COLUMNS): row
+        for row in conn.execute(
+            select(table).where(
+                table.c.destination.in_(stats["destination"].unique().tolist()),
+                table.c.day.in_(stats["day"].unique().tolist())
+            )
+        ).mappings()
+    }
+
+    now = datetime.utcnow()
+    for record in stats.to_dict("records"):
+        key = tuple(record[column] for column in KEY_COLUMNS)
+        current = existing.get(key)
+        histogram = dict(record["histogram"])
+        count, low, high, total = int(record["count"]), float(record["min_price"]), float(record["max_price"]), float(record["sum_price"])
+        if current is not None:
+            for bucket, bucket_count in (current["histogram"] or {}).items():
+                histogram[bucket] = histogram.get(bucket, 0) + bucket_count
+            count += current["count"]
+            low = min(low, current["min_price"])
+            high = max(high, current["max_price"])
+            total += current["sum_price"]
+
+        values = {
+            "count": count,
+            "min_price": low,
+            "max_price": high,
+            "sum_price": total,
+            "median_price": histogram_percentile(histogram, 0.5, low, high),
+            "p90_price": histogram_percentile(histogram, 0.9, low, high),
+            "histogram": histogram,
+            "updated_at": now,
+        }
+        if current is None:
+            conn.execute(insert(table).values(**dict(zip(KEY_COLUMNS, key)), **values))
+        else:
+            conn.execute(update(table).where(table.c.id == current["id"]).values(**values))
+    return len(stats)
+
+class _Superseded(Exception):
+    """Another roll-up advanced the watermark first; this batch is discarded."""
+
+def watermark(conn: Connection) -> Tuple[Optional[datetime], int]:
+    state = AggregationState.__table__
+    row = conn.execute(select(state).where(state.c.name == STATE_NAME)).mappings().first()
+    if row is None:
+        return None, 0
+    return row["last_created_at"], row["last_id"] or 0
+
+def _ensure_state():
+    state = AggregationState.__table__
+    with engine.begin() as conn:
+        if conn.execute(select(state.c.name).where(state.c.name == STATE_NAME)).first() is not None:
+            return
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(state).values(name=STATE_NAME, last_created_at=None, last_id=0))
+    except IntegrityError:
+        pass  # Created concurrently
+
+def roll_up(until: Optional[datetime] = None, batch_size: Optional[int] = None) -> int:
+    """
+    Fold search_results rows created before `until` (and at least AGGREGATE_LAG
+    ago) into price_aggregates, in (created_at, id) order from where the
+    previous roll-up stopped. Each batch is one transaction that also advances
+    the watermark, guarded on its old value, so concurrent roll-ups never
+    count a row twice. Returns the number of rows rolled up.
+    """
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    latest = datetime.utcnow() - timedelta(seconds=settings.AGGREGATE_LAG)
+    until = min(until, latest) if until is not None else latest
+    _ensure_state()
+
+    results, searches, state = SearchResult.__table__, Search.__table__, AggregationState.__table__
+    rolled_up = 0
+    while True:
+        try:
+            with engine.begin() as conn:
+                last_created_at, last_id = watermark(conn)
+                query = (
+                    select(
+                        results.c.id,
+                        results.c.created_at,
+                        results.c.site,
+                        results.c.type,
+                        results.c.currency,
+                        results.c.price,
+                        searches.c.destination
+                    )
+                    .join(searches, searches.c.id == results.c.search_id)
+                    .where(results.c.created_at < until)
+                    .order_by(results.c.created_at, results.c.id)
+                    .limit(batch_size)
+                )
+                if last_created_at is not None:
+                    query = query.where(or_(
+                        results.c.created_at > last_created_at,
+                        and_(results.c.created_at == last_created_at, results.c.id > last_id)
+                    ))
+                rows = conn.execute(query).mappings().all()
+                if not rows:
+                    return rolled_up
+
+                unchanged = (
+                    state.c.last_created_at.is_(None) if last_created_at is None
+                    else state.c.last_created_at == last_created_at
+                )
+                advanced = conn.execute(
+                    update(state)
+                    .where(state.c.name == STATE_NAME, unchanged, state.c.last_id == last_id)
+                    .values(last_created_at=rows[-1]["created_at"], last_id=rows[-1]["id"])
+                ).rowcount
+                if not advanced:
+                    raise _Superseded()
+                merge(conn, summarize(pd.DataFrame([dict(row) for row in rows])))
+        except _Superseded:
+            return rolled_up
+        rolled_up += len(rows)
+        if len(rows) < batch_size:
+            return rolled_up
+
+def rolled_up_until() -> Optional[datetime]:
+    """Rows created before this have all been rolled up."""
+    with engine.connect() as conn:
+        return watermark(conn)[0]
\ No newline at end of file
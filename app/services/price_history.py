@@ -0,0 +1,105 @@
+from typing import Any, Dict, List, Optional
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from ..config import settings
+from ..database import engine
+from ..models import PriceAggregate
+from .price_aggregates import BUCKET_RATIO, bucket_of
+
+AGGREGATE_COLUMNS = ["day", "site", "count", "min_price", "max_price", "sum_price", "histogram"]
+
+def normalize_destination(destination: str) -> str:
+    return " ".join(destination.split()).lower()
+
+def load_aggregates(destination: str, result_type: str, site: Optional[str] = None, days: Optional[int] = None) -> pd.DataFrame:
+    """Daily aggregates for one destination and result type over the last `days` days."""
+    table = PriceAggregate.__table__
+    since = date.today() - timedelta(days=days or settings.PRICE_HISTORY_DAYS)
+    query = select(*(table.c[column] for column in AGGREGATE_COLUMNS)).where(
+        table.c.destination == normalize_destination(destination),
+        table.c.type == result_type,
+        table.c.day >= since
+    )
+    if site is not None:
+        query = query.where(table.c.site == site)
+    with engine.connect() as conn:
+        rows = conn.execute(query.order_by(table.c.day)).all()
+    return pd.DataFrame(rows, columns=AGGREGATE_COLUMNS)
+
+def _bucket_counts(frame: pd.DataFrame, group: str) -> pd.DataFrame:
+    """Histograms of every row merged per group: columns group, bucket, count, sorted by bucket."""
+    groups = np.repeat(frame[group].to_numpy(), [len(histogram) for histogram in frame["histogram"]])
+    buckets = np.fromiter((int(bucket) for histogram in frame["histogram"] for bucket in histogram), dtype=np.int64)
+    counts = np.fromiter((count for histogram in frame["histogram"] for count in histogram.values()), dtype=np.int64)
+    merged = pd.DataFrame({group: groups, "bucket": buckets, "count": counts})
+    return merged.groupby([group, "bucket"], as_index=False)["count"].sum().sort_values([group, "bucket"])
+
+def _quantile(bucket_counts: pd.DataFrame, group: str, q: float) -> pd.Series:
+    """q-quantile per group from merged bucket counts, interpolated log-linearly within the bucket."""
+    cumulative = bucket_counts.groupby(group)["count"].cumsum()
+    target = q * bucket_counts.groupby(group)["count"].transform("sum")
+    first = (cumulative >= target) & ~(cumulative >= target).groupby(bucket_counts[group]).shift(fill_value=False).astype(bool)
+    reached = bucket_counts[first]
+    before = cumulative[first] - reached["count"]
+    fraction = (target[first] - before) / reached["count"]
+    return pd.Series((BUCKET_RATIO ** (reached["bucket"] + fraction)).to_numpy(), index=reached[group].to_numpy())
+
+def trend(frame: pd.DataFrame, period: str = "day") -> List[Dict[str, Any]]:
+    """Price stats per "day" or "week", merged across sites."""
+    if frame.empty:
+        return []
+    frame = frame.copy()
+    days = pd.to_datetime(frame["day"])
+    frame["period"] = (days.dt.to_period("W").dt.start_time if period == "week" else days).dt.date
+
+    stats = frame.groupby("period").agg(
+        count=("count", "sum"),
+        min_price=("min_price", "min"),
+        max_price=("max_price", "max"),
+        sum_price=("sum_price", "sum")
+    )
+    bucket_counts = _bucket_counts(frame, "period")
+    stats["mean_price"] = stats["sum_price"] / stats["count"]
+    # Histogram midpoints can fall outside the exact range; clamp them back in
+    for name, q in (("median_price", 0.5), ("p90_price", 0.9)):
+        stats[name] = _quantile(bucket_counts, "period", q).clip(lower=stats["min_price"], upper=stats["max_price"])
+    stats = stats.drop(columns="sum_price").reset_index()
+    return stats.round({"mean_price": 2, "median_price": 2, "p90_price": 2}).to_dict("records")
+
+def percentile_of(frame: pd.DataFrame, price: float) -> Optional[float]:
+    """Share (0-100) of historical prices below `price`, counting half of its own bucket."""
+    if frame.empty or price <= 0:
+        return None
+    bucket = bucket_of(np.array([price], dtype=np.float64))[0]
+    counts = _bucket_counts(frame.assign(all=0), "all")
+    below = counts.loc[counts["bucket"] < bucket, "count"].sum()
+    same = counts.loc[counts["bucket"] == bucket, "count"].sum()
+    return float(100 * (below + same / 2) / counts["count"].sum())
+
+def deal_signal(frame: pd.DataFrame, price: float) -> Dict[str, Any]:
+    """How `price` compares with history: "good_deal", "typical", "expensive" or "unknown"."""
+    samples = int(frame["count"].sum()) if not frame.empty else 0
+    percentile = percentile_of(frame, price)
+    if percentile is None or samples < settings.PRICE_HISTORY_MIN_SAMPLES:
+        signal = "unknown"
+    elif percentile <= settings.PRICE_DEAL_PERCENTILE:
+        signal = "good_deal"
+    elif percentile > settings.PRICE_EXPENSIVE_PERCENTILE:
+        signal = "expensive"
+    else:
+        signal = "typical"
+
+    median = None
+    if samples:
+        bucket_counts = _bucket_counts(frame.assign(all=0), "all")
+        median = float(np.clip(_quantile(bucket_counts, "all", 0.5).iloc[0], frame["min_price"].min(), frame["max_price"].max()))
+    return {
+        "price": price,
+        "signal": signal,
+        "percentile": round(percentile, 1) if percentile is not None else None,
+        "historical_median": round(median, 2) if median is not None else None,
+        "historical_min": float(frame["min_price"].min()) if samples else None,
+        "samples": samples,
+    }
\ No newline at end of file
@@ -0,0 +1,56 @@
+from typing import List, Optional
+import numpy as np
+from ..config import settings
+from ..records import ResultRecord
+
+RANKING_FIELDS = ("price", "rating", "reviews_count")
+RANKING_DTYPE = np.dtype([(field, np.float64) for field in RANKING_FIELDS])
+
+def to_array(options: List[ResultRecord]) -> np.ndarray:
+    """Pack the ranking features of each option into a structured array; missing values become NaN."""
+    array = np.empty(len(options), dtype=RANKING_DTYPE)
+    for field in RANKING_FIELDS:
+        # Records are already validated, so values are numbers or None
+        values = (getattr(option, field) for option in options)
+        array[field] = np.fromiter((np.nan if value is None else value for value in values), dtype=np.float64, count=len(options))
+    return array
+
+def _min_max(column: np.ndarray) -> np.ndarray:
+    # Scale to [0, 1]; a constant column scales to 0 and missing values rank as the minimum
+    present = ~np.isnan(column)
+    if not present.any():
+        return np.zeros_like(column)
+    low = column[present].min()
+    span = column[present].max() - low
+    scaled = (column - low) / span if span > 0 else np.zeros_like(column)
+    return np.where(present, scaled, 0.0)
+
+def score(options: List[ResultRecord], result_type: str) -> np.ndarray:
+    """
+    Weighted sum of min-max scaled features. Weights come from RANKING_WEIGHTS
+    for the result type; negative weights mean lower is better (price).
+    """
+    weights = settings.RANKING_WEIGHTS.get(result_type, settings.RANKING_WEIGHTS["default"])
+    features = to_array(options)
+    scores = np.zeros(len(options), dtype=np.float64)
+    for field, weight in weights.items():
+        scores += weight * _min_max(features[field])
+    return scores
+
+def rank(options: List[ResultRecord], result_type: str, k: Optional[int] = None) -> List[int]:
+    """Indices of the best k options (all of them by default), best first."""
+    if not options:
+        return []
+    scores = score(options, result_type)
+    if k is not None and k < len(options):
+        top = np.argpartition(-scores, k)[:k]
+        return top[np.argsort(-scores[top], kind="stable")].tolist()
+    return np.argsort(-scores, kind="stable").tolist()
+
+def top_k(options: List[ResultRecord], result_type: str, k: Optional[int] = None) -> List[ResultRecord]:
+    return [options[i] for i in rank(options, result_type, k)]
+
+def best_option(options: List[ResultRecord], result_type: str) -> Optional[ResultRecord]:
+    if not options:
+        return None
+    return options[int(np.argmax(score(options, result_type)))]
\ No newline at end of file
@@ -0,0 +1,142 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+import asyncio
+import logging
+import time
+from sqlalchemy import insert
+from ..config import settings
+from ..database import engine, run_db
+from ..models import SearchResult
+from ..records import RECORD_FIELDS, ResultRecord
+
+logger = logging.getLogger(__name__)
+
+# executemany needs every row to bind the same columns; every record field is one
+RESULT_COLUMNS = list(RECORD_FIELDS)
+
+class ResultWriter:
+    """
+    Write-behind persistence for scraped results.
+
+    Searches enqueue their rows and return immediately; a background task
+    drains the queue and writes rows from many searches in batched
+    executemany INSERTs. The queue is bounded, so a slow database applies
+    backpressure instead of growing memory without limit.
+    """
+
+    def __init__(self):
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.batches_written = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._closing
+
+    async def start(self):
+        if self.running:
+            return
+        self.queue = asyncio.Queue(maxsize=settings.RESULT_QUEUE_MAX_SIZE)
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop accepting rows and wait until everything queued has been flushed."""
+        if self._task is None:
+            return
+        self._closing = True
+        await self._task
+        self._task = None
+
+    @staticmethod
+    def to_rows(search_id: int, results: List[ResultRecord]) -> List[Dict[str, Any]]:
+        created_at = datetime.utcnow()
+        rows = []
+        for result in results:
+            row = result.to_dict()
+            row["search_id"] = search_id
+            row["created_at"] = created_at
+            rows.append(row)
+        return rows
+
+    async def enqueue(self, search_id: int, results: List[ResultRecord]):
+        rows = self.to_rows(search_id, results)
+        if not self.running:
+            # Outside the app lifespan (scripts, benchmarks) write synchronously
+            if rows:
+                await self._flush(rows)
+            return
+        for row in rows:
+            await self.queue.put(row)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        getter = None
+        while not (self._closing and self.queue.empty()):
+            # Collect up to a batch of rows, waiting at most one flush interval
+            batch = []
+            deadline = loop.time() + settings.RESULT_FLUSH_INTERVAL
+            while len(batch) < settings.RESULT_WRITE_BATCH_SIZE and not (self._closing and self.queue.empty()):
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                # Keep one pending get() across wake-ups so no row is lost to a timeout
+                if getter is None:
+                    getter = asyncio.ensure_future(self.queue.get())
+                await asyncio.wait({getter}, timeout=min(timeout, 0.1))
+                if getter.done():
+                    batch.append(getter.result())
+                    getter = None
+            if batch:
+                await self._flush(batch)
+        if getter is not None:
+            # The pending get() may have taken a row after the last batch was collected
+            if getter.done():
+                await self._flush([getter.result()])
+            else:
+                getter.cancel()
+
+    async def _flush(self, rows: List[Dict[str, Any]]):
+        started = time.perf_counter()
+        try:
+            await run_db(self._insert, rows)
+        except Exception:
+            logger.exception("Failed to write %d search results", len(rows))
+            self.rows_failed += len(rows)
+            return
+
+        elapsed = time.perf_counter() - started
+        self.rows_written += len(rows)
+        self.batches_written += 1
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        self.total_flush_seconds += elapsed
+
+    @staticmethod
+    def _insert(rows: List[Dict[str, Any]]):
+        with engine.begin() as conn:
+            conn.execute(insert(SearchResult.__table__), rows)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "queue_max_size": settings.RESULT_QUEUE_MAX_SIZE,
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "batches_written": self.batches_written,
+            "last_flush_seconds": self.last_flush_seconds,
+            "max_flush_seconds": self.max_flush_seconds,
+            "avg_flush_seconds": self.total_flush_seconds / self.batches_written if self.batches_written else 0.0,
+        }
+
+result_writer = ResultWriter()
\ No newline at end of file
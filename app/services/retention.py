@@ -0,0 +1,177 @@
+"""
+Retention and compaction for the tables that grow with every search.
+
+search_results gains dozens of rows per search and is only read while a
+search is recent. A compaction pass first rolls raw results up into daily
+price_aggregates (see price_aggregates.py), then deletes rows older than
+RESULT_RETENTION_DAYS that have been rolled up, along with finished scrape
+jobs. With COMPACTION_ARCHIVE_DIR set, deleted rows are first appended to
+one gzipped JSON lines file per day. Every step runs in RETENTION_BATCH_SIZE
+chunks, each in its own short transaction, walking the created_at index so
+a pass never holds long locks or scans the whole table. Search rows
+themselves are kept as the users' history.
+
+The API rolls up new results every PRICE_ROLLUP_INTERVAL seconds, so price
+history stays current, and runs a full pass every COMPACTION_INTERVAL
+seconds. A pass can also be run on its own, e.g. from cron:
+
+    python -m app.services.retention --days 30
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+from sqlalchemy import Table, and_, delete, select
+from sqlalchemy.sql.elements import ColumnElement
+from ..config import settings
+from ..database import engine, run_db
+from ..models import ScrapeJob, SearchResult
+from .price_aggregates import roll_up, rolled_up_until
+
+logger = logging.getLogger(__name__)
+
+def delete_in_batches(table: Table, condition: ColumnElement, order_by: ColumnElement, batch_size: int) -> int:
+    """Delete matching rows batch_size at a time. Returns the number deleted."""
+    deleted = 0
+    while True:
+        batch = select(table.c.id).where(condition).order_by(order_by).limit(batch_size)
+        with engine.begin() as conn:
+            count = conn.execute(delete(table).where(table.c.id.in_(batch.scalar_subquery()))).rowcount
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+def archive_rows(directory: str, rows: List[Dict[str, Any]]):
+    """Append rows to search_results-<day>.jsonl.gz files, one per creation day."""
+    os.makedirs(directory, exist_ok=True)
+    by_day: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_day.setdefault(row["created_at"].date().isoformat(), []).append(row)
+    for day, day_rows in by_day.items():
+        # Appending adds a gzip member; readers see one continuous stream
+        with gzip.open(os.path.join(directory, f"search_results-{day}.jsonl.gz"), "at", encoding="utf-8") as archive:
+            for row in day_rows:
+                archive.write(json.dumps(row, default=str) + "\n")
+
+def archive_in_batches(directory: str, condition: ColumnElement, batch_size: int) -> int:
+    """
+    Archive then delete matching search_results rows batch_size at a time.
+    A batch whose delete fails is archived again by the next pass, so
+    archives can hold duplicates (with the same id) but never miss a row.
+    """
+    table = SearchResult.__table__
+    archived = 0
+    while True:
+        with engine.begin() as conn:
+            rows = [
+                dict(row) for row in
+                conn.execute(select(table).where(condition).order_by(table.c.created_at).limit(batch_size)).mappings()
+            ]
+            if rows:
+                archive_rows(directory, rows)
+                conn.execute(delete(table).where(table.c.id.in_([row["id"] for row in rows])))
+        archived += len(rows)
+        if len(rows) < batch_size:
+            return archived
+
+def purge_expired(
+    days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    archive_dir: Optional[str] = None
+) -> Dict[str, int]:
+    """Run one compaction pass. Returns row counts per step."""
+    days = settings.RESULT_RETENTION_DAYS if days is None else days
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    archive_dir = archive_dir or settings.COMPACTION_ARCHIVE_DIR
+    counts = {"rolled_up": roll_up(batch_size=batch_size), "search_results": 0, "scrape_jobs": 0}
+    if days <= 0:
+        return counts
+
+    # Only rows already folded into price_aggregates may go
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    aggregated = rolled_up_until()
+    if aggregated is not None:
+        results = SearchResult.__table__
+        expired = results.c.created_at < min(cutoff, aggregated)
+        if archive_dir:
+            counts["search_results"] = archive_in_batches(archive_dir, expired, batch_size)
+        else:
+            counts["search_results"] = delete_in_batches(results, expired, results.c.created_at, batch_size)
+
+    jobs = ScrapeJob.__table__
+    counts["scrape_jobs"] = delete_in_batches(
+        jobs,
+        and_(jobs.c.finished_at.isnot(None), jobs.c.finished_at < cutoff),
+        jobs.c.id,
+        batch_size
+    )
+    return counts
+
+class Compactor:
+    """
+    Background loops, run inside the app: new results are rolled up into
+    price_aggregates every PRICE_ROLLUP_INTERVAL seconds, and a full
+    compaction pass runs every COMPACTION_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        if self._tasks:
+            return
+        if settings.PRICE_ROLLUP_INTERVAL > 0:
+            self._tasks.append(asyncio.create_task(self._every(settings.PRICE_ROLLUP_INTERVAL, self._roll_up)))
+        if settings.COMPACTION_INTERVAL > 0:
+            self._tasks.append(asyncio.create_task(self._every(settings.COMPACTION_INTERVAL, self._compact)))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    async def _every(interval: float, func: Callable[[], Awaitable[None]]):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await func()
+            except Exception:
+                logger.exception("%s failed", func.__name__)
+
+    @staticmethod
+    async def _roll_up():
+        rolled_up = await run_db(roll_up)
+        if rolled_up:
+            logger.info("Rolled up %d search results into price aggregates", rolled_up)
+
+    @staticmethod
+    async def _compact():
+        counts = await run_db(purge_expired)
+        logger.info(
+            "Compaction rolled up %d results, deleted %d results and %d scrape jobs",
+            counts["rolled_up"], counts["search_results"], counts["scrape_jobs"]
+        )
+
+compactor = Compactor()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roll up and delete stored search results past their retention period")
+    parser.add_argument("--days", type=int, default=settings.RESULT_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.RETENTION_BATCH_SIZE)
+    parser.add_argument("--archive-dir", default=settings.COMPACTION_ARCHIVE_DIR)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    counts = purge_expired(args.days, args.batch_size, args.archive_dir)
+    logger.info(
+        "Rolled up %d search results, deleted %d search results and %d scrape jobs",
+        counts["rolled_up"], counts["search_results"], counts["scrape_jobs"]
+    )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,15 +1,71 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Set, AsyncIterator
 from ..scrapers.booking import BookingScraper
 from ..scrapers.airbnb import AirbnbScraper
 from ..scrapers.despegar import DespegarScraper
 from ..scrapers.kayak import KayakScraper
 from ..scrapers.expedia import ExpediaScraper
+from ..scrapers.base import RESULT_TYPES, BaseScraper, page_sink
 from ..models import Search, SearchResult
+from ..records import ResultRecord, to_records
+from ..database import engine, run_db
+from ..config import settings
+from .cache import search_cache, search_key
+from .circuit_breaker import CircuitOpenError, circuit_breakers
+from .deadlines import hedged, latency_tracker, site_deadline
+from .result_writer import RESULT_COLUMNS, ResultWriter, result_writer
+from . import metrics, ranking
+from .singleflight import SingleFlight
+from .hot_searches import hot_searches
+from .jobs import DONE, FAILED, FINISHED, RUNNING, TIMEOUT_ERROR, get_job_queue, search_status
+from sqlalchemy import func, insert, update
 from sqlalchemy.orm import Session
 import asyncio
+import time
 from datetime import datetime
-import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+
+# In-flight scraper fan-outs keyed on fan_out_key
+inflight_searches = SingleFlight()
+# In-flight cache refreshes keyed on (search key, site, result type)
+inflight_refreshes = SingleFlight()
+
+class PlanStats:
+    """Scraper calls planned per search, and those skipped because the scraper can't serve them."""
+
+    def __init__(self):
+        self.searches = 0
+        self.empty = 0
+        self.planned = 0
+        self.skipped: Dict[str, int] = {}
+
+    def record(self, plan: List[Tuple[str, str]], skipped: Dict[Tuple[str, str], str]):
+        self.searches += 1
+        self.planned += len(plan)
+        if not plan:
+            self.empty += 1
+        for (site, result_type), reason in skipped.items():
+            key = f"{site}:{result_type}:{reason}"
+            self.skipped[key] = self.skipped.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "searches": self.searches,
+            "empty_plans": self.empty,
+            "planned_calls": self.planned,
+            "avg_planned_calls": self.planned / self.searches if self.searches else 0.0,
+            "skipped_calls": sum(self.skipped.values()),
+            "skipped": dict(self.skipped),
+        }
+
+fan_out_plans = PlanStats()
+
+def fan_out_key(search_params: Dict[str, Any]) -> Tuple[str, str, str]:
+    # Country and currency don't change what a site returns, only which sites are
+    # planned, so they stay out of the cache key but searches must match on them to share
+    return (
+        search_key(search_params),
+        (search_params.get("country") or "").upper(),
+        (search_params.get("currency") or "").upper()
+    )
 
 class SearchService:
     def __init__(self):
@@ -20,9 +76,9 @@ class SearchService:
             KayakScraper(),
             ExpediaScraper()
         ]
+        self._background: Set[asyncio.Task] = set()
     
-    async def search_all(self, db: Session, search_params: Dict[str, Any]) -> Dict[str, Any]:
-        # Create search record
+    def _create_search(self, db: Session, search_params: Dict[str, Any], status: str = DONE) -> Search:
         search = Search(
             user_id=search_params.get("user_id"),
             destination=search_params["destination"],
@@ -30,91 +86,559 @@ class SearchService:
             end_date=search_params["end_date"],
             guests=search_params["guests"],
             budget=search_params["budget"],
-            origin=search_params.get("origin")
+            origin=search_params.get("origin"),
+            status=status
         )
         db.add(search)
         db.commit()
-        
-        # Gather results from all scrapers concurrently
-        tasks = []
+        # Load generated columns here, in the DB thread, rather than lazily on the event loop
+        db.refresh(search)
+        return search
+    
+    def plan(self, search_params: Dict[str, Any]) -> Tuple[List[Tuple[str, str]], Dict[Tuple[str, str], str]]:
+        """
+        (site, result type) pairs worth scraping for these params, from each
+        scraper's capabilities, and the skipped pairs with the reason.
+        """
+        plan, skipped = [], {}
         for scraper in self.scrapers:
-            tasks.extend([
-                asyncio.create_task(scraper.search_accommodations(search_params)),
-                asyncio.create_task(scraper.search_flights(search_params))
-            ])
-        
-        # Wait for all scraping tasks to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result_type in RESULT_TYPES:
+                reason = scraper.skip_reason(result_type, search_params)
+                if reason is None:
+                    plan.append((scraper.SITE_NAME, result_type))
+                else:
+                    skipped[(scraper.SITE_NAME, result_type)] = reason
+        return plan, skipped
+    
+    def _plan(self, search_params: Dict[str, Any]) -> List[Tuple[str, str]]:
+        plan, skipped = self.plan(search_params)
+        fan_out_plans.record(plan, skipped)
+        return plan
+    
+    def _start_tasks(self, search_params: Dict[str, Any]) -> Dict[asyncio.Task, Tuple[str, str]]:
+        # One task per site and result type the scrapers can serve, using cached results where fresh
+        cache_key = search_key(search_params)
+        tasks = {}
+        for site, result_type in self._plan(search_params):
+            task = asyncio.create_task(self.scrape_site(site, result_type, search_params, cache_key))
+            tasks[task] = (site, result_type)
+        return tasks
+    
+    async def scrape_site(self, site: str, result_type: str, search_params: Dict[str, Any], cache_key: Optional[str] = None) -> List[ResultRecord]:
+        """Results of one site and result type, from cache or scraped within the site deadline."""
+        scraper = next(scraper for scraper in self.scrapers if scraper.SITE_NAME == site)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            results = await self._scrape(scraper, result_type, search_params, cache_key or search_key(search_params))
+            outcome = "ok" if results else "empty"
+            return results
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        except CircuitOpenError:
+            outcome = "circuit_open"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            metrics.scrape_seconds.labels(site, result_type, outcome).observe(time.perf_counter() - started)
+    
+    async def search_all(self, db: Session, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        job_queue = get_job_queue()
+        # Queued searches stay "running" until a worker finishes their last job
+        plan = self._plan(search_params) if job_queue is not None else []
         
-        # Process results, filtering out exceptions
-        all_results = []
-        for result in results:
-            if isinstance(result, Exception):
-                print(f"Error during scraping: {result}")
-                continue
-            if isinstance(result, list):
-                all_results.extend(result)
+        # Create search record
+        search = await run_db(self._create_search, db, search_params, RUNNING if plan else DONE)
+        search_id = search.id
+        hot_searches.record(search_params)
         
-        # Close all scraper sessions
-        for scraper in self.scrapers:
-            await scraper.close()
+        if job_queue is not None:
+            # Workers scrape and store the results; wait for them up to the deadline
+            all_results, timed_out_sites = await self._wait_for_jobs(search_id, search_params, plan)
+        else:
+            # Identical searches already in flight share one scraper fan-out; each
+            # caller still gets its own Search row and stored results
+            all_results, timed_out_sites = await inflight_searches.do(
+                fan_out_key(search_params),
+                lambda: self._fan_out(search_params)
+            )
         
         # Process and store results
-        processed_results = self._process_results(db, search.id, all_results)
+        processed_results = await self._process_results(search_id, all_results, store=job_queue is None)
+        metrics.search_seconds.labels("sync").observe(time.perf_counter() - started)
         
         return {
-            "id": search.id,
+            "id": search_id,
             "best_flight": processed_results["best_flight"],
             "best_accommodation": processed_results["best_accommodation"],
             "all_flights": processed_results["flights"],
             "all_accommodations": processed_results["accommodations"],
             "total_found": len(all_results),
+            "timed_out_sites": sorted(timed_out_sites),
             "created_at": datetime.utcnow()
         }
     
-    def _process_results(self, db: Session, search_id: int, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        flights = [r for r in results if r["type"] == "flight"]
-        accommodations = [r for r in results if r["type"] == "accommodation"]
+    async def _fan_out(self, search_params: Dict[str, Any]) -> Tuple[List[ResultRecord], Set[str]]:
+        # Gather results from all scrapers concurrently
+        tasks = self._start_tasks(search_params)
+        if not tasks:
+            # No scraper serves these params (asyncio.wait rejects an empty set)
+            return [], set()
         
-        # Store results in database
-        for result in results:
-            db_result = SearchResult(
-                search_id=search_id,
-                **result
-            )
-            db.add(db_result)
-        db.commit()
+        # Wait for scraping tasks until the search deadline, then give up on stragglers
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=settings.SEARCH_DEADLINE)
+        except asyncio.CancelledError:
+            # Every caller of this shared fan-out gave up; stop scraping for it
+            for task in tasks:
+                task.cancel()
+            raise
+        for task in pending:
+            task.cancel()
+        timed_out_sites = {tasks[task][0] for task in pending}
         
-        # Find best options using a scoring system
-        best_flight = self._find_best_option(flights) if flights else None
-        best_accommodation = self._find_best_option(accommodations) if accommodations else None
+        # Process results, filtering out exceptions
+        all_results = []
+        for task in done:
+            if isinstance(task.exception(), asyncio.TimeoutError):
+                timed_out_sites.add(tasks[task][0])
+                continue
+            if isinstance(task.exception(), CircuitOpenError):
+                continue
+            if task.exception() is not None:
+                print(f"Error during scraping: {task.exception()}")
+                continue
+            all_results.extend(task.result())
+        return all_results, timed_out_sites
+    
+    async def start_search(self, db: Session, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create the search and scrape it in the background, returning at once.
+        Results land in search_results and the search's status becomes "done".
+        With a JOB_BACKEND other than "inline" the scraping is queued for the
+        workers, and job_status() and follow_jobs() report its progress.
+        """
+        plan = self._plan(search_params)
+        search = await run_db(self._create_search, db, search_params, RUNNING if plan else DONE)
+        search_id = search.id
+        hot_searches.record(search_params)
+        if not plan:
+            return {"id": search_id, "status": DONE, "created_at": search.created_at}
         
+        job_queue = get_job_queue()
+        if job_queue is not None:
+            await run_db(job_queue.enqueue, search_id, search_params, plan)
+        else:
+            task = asyncio.create_task(self._search_in_background(search_id, search_params))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return {"id": search_id, "status": RUNNING, "created_at": search.created_at}
+    
+    async def _search_in_background(self, search_id: int, search_params: Dict[str, Any]):
+        started = time.perf_counter()
+        try:
+            all_results, _ = await inflight_searches.do(
+                fan_out_key(search_params),
+                lambda: self._fan_out(search_params)
+            )
+        except Exception as e:
+            print(f"Error during background search {search_id}: {e!r}")
+            await run_db(self._finish_search, search_id, [], FAILED)
+            return
+        await run_db(self._finish_search, search_id, all_results, DONE)
+        metrics.search_seconds.labels("background").observe(time.perf_counter() - started)
+    
+    @staticmethod
+    def _finish_search(search_id: int, results: List[ResultRecord], status: str):
+        # Rows and status change together, so a "done" search always has its results
+        with engine.begin() as conn:
+            if results:
+                conn.execute(insert(SearchResult.__table__), ResultWriter.to_rows(search_id, results))
+            conn.execute(update(Search.__table__).where(Search.id == search_id).values(status=status))
+    
+    @staticmethod
+    def get_search(db: Session, search_id: int) -> Optional[Search]:
+        return db.query(Search).filter(Search.id == search_id).first()
+    
+    @staticmethod
+    def history(db: Session, user_id: int, limit: int = 20, offset: int = 0) -> List[Search]:
+        return (
+            db.query(Search)
+            .filter(Search.user_id == user_id)
+            .order_by(Search.created_at.desc(), Search.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+    
+    async def search_details(self, db: Session, search: Search) -> Dict[str, Any]:
+        """A stored search with its status, result counts and best options."""
+        job_queue = get_job_queue()
+        jobs = await run_db(job_queue.jobs, search.id) if job_queue is not None else []
+        results = await run_db(self._stored_results, db, search.id)
+        flights, accommodations = self._split(results)
         return {
-            "flights": flights,
-            "accommodations": accommodations,
-            "best_flight": best_flight,
-            "best_accommodation": best_accommodation
+            "id": search.id,
+            "status": search_status(jobs) if jobs else search.status or DONE,
+            "destination": search.destination,
+            "origin": search.origin,
+            "start_date": search.start_date,
+            "end_date": search.end_date,
+            "guests": search.guests,
+            "budget": search.budget,
+            "created_at": search.created_at,
+            "total_found": len(results),
+            "flights_found": len(flights),
+            "accommodations_found": len(accommodations),
+            "best_flight": ranking.best_option(flights, "flight"),
+            "best_accommodation": ranking.best_option(accommodations, "accommodation"),
+            "jobs": jobs or None
+        }
+    
+    @staticmethod
+    def _stored_results(db: Session, search_id: int) -> List[ResultRecord]:
+        columns = [getattr(SearchResult, column) for column in RESULT_COLUMNS]
+        rows = db.query(*columns).filter(SearchResult.search_id == search_id).all()
+        return [ResultRecord.from_row(row._mapping) for row in rows]
+    
+    @staticmethod
+    def results_page(
+        db: Session,
+        search_id: int,
+        result_type: Optional[str] = None,
+        site: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """One page of a search's stored results, cheapest first."""
+        query = db.query(*(getattr(SearchResult, column) for column in RESULT_COLUMNS)).filter(SearchResult.search_id == search_id)
+        if result_type is not None:
+            query = query.filter(SearchResult.type == result_type)
+        if site is not None:
+            query = query.filter(func.lower(SearchResult.site) == site.lower())
+        total = query.order_by(None).count()
+        rows = query.order_by(SearchResult.price, SearchResult.id).offset(offset).limit(limit).all()
+        return {
+            "search_id": search_id,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "results": [ResultRecord.from_row(row._mapping) for row in rows]
         }
     
-    def _find_best_option(self, options: List[Dict[str, Any]]) -> Dict[str, Any]:
-        if not options:
+    async def job_status(self, search_id: int) -> Optional[Dict[str, Any]]:
+        """Progress of a queued search, or None if it has no jobs."""
+        job_queue = get_job_queue()
+        jobs = await run_db(job_queue.jobs, search_id) if job_queue is not None else []
+        if not jobs:
             return None
+        return {
+            "id": search_id,
+            "status": search_status(jobs),
+            "jobs": jobs,
+            "total_found": sum(job["result_count"] or 0 for job in jobs)
+        }
+    
+    async def _wait_for_jobs(self, search_id: int, search_params: Dict[str, Any], plan: List[Tuple[str, str]]) -> Tuple[List[ResultRecord], Set[str]]:
+        if not plan:
+            return [], set()
+        job_queue = get_job_queue()
+        await run_db(job_queue.enqueue, search_id, search_params, plan)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.SEARCH_DEADLINE
+        while True:
+            jobs = await run_db(job_queue.jobs, search_id)
+            remaining = deadline - loop.time()
+            if remaining <= 0 or all(job["status"] in FINISHED for job in jobs):
+                break
+            await asyncio.sleep(min(settings.JOB_POLL_INTERVAL, remaining))
+        
+        timed_out_sites = {
+            job["site"] for job in jobs
+            if job["status"] not in FINISHED or job["error"] == TIMEOUT_ERROR
+        }
+        return await run_db(job_queue.results, search_id), timed_out_sites
+    
+    async def follow_jobs(self, search_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a queued search: an event per job as workers finish it, in the
+        same shape as search_stream, until every job is done or the deadline passes.
+        """
+        job_queue = get_job_queue()
+        reported = set()
+        flights, accommodations = [], []
+        timed_out_sites = set()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.SEARCH_DEADLINE
+        while True:
+            jobs = await run_db(job_queue.jobs, search_id)
+            for job in jobs:
+                if job["status"] not in FINISHED or job["id"] in reported:
+                    continue
+                reported.add(job["id"])
+                site, result_type = job["site"], job["type"]
+                if job["status"] != DONE:
+                    if job["error"] == TIMEOUT_ERROR:
+                        timed_out_sites.add(site)
+                        yield {"event": "timeout", "site": site, "type": result_type}
+                    else:
+                        yield {"event": "error", "site": site, "type": result_type, "detail": job["error"]}
+                    continue
+                
+                results = await run_db(job_queue.results, search_id, site, result_type)
+                (flights if result_type == "flight" else accommodations).extend(results)
+                yield {
+                    "event": "results",
+                    "site": site,
+                    "type": result_type,
+                    "results": results,
+                    "best_flight": ranking.best_option(flights, "flight"),
+                    "best_accommodation": ranking.best_option(accommodations, "accommodation")
+                }
+            
+            if len(reported) == len(jobs):
+                break
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                for job in jobs:
+                    if job["id"] not in reported:
+                        timed_out_sites.add(job["site"])
+                        yield {"event": "timeout", "site": job["site"], "type": job["type"]}
+                break
+            await asyncio.sleep(min(settings.JOB_POLL_INTERVAL, remaining))
+        
+        yield {
+            "event": "done",
+            "id": search_id,
+            "total_found": len(flights) + len(accommodations),
+            "timed_out_sites": sorted(timed_out_sites)
+        }
+    
+    async def search_stream(self, db: Session, search_params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Like search_all, but yields results as soon as each result page is parsed
+        instead of waiting for the slowest scraper. Page events have "partial"
+        set; each site/result type ends with a non-partial event carrying any
+        results not sent yet (all of them for cached results).
+        """
+        started = time.perf_counter()
+        search = await run_db(self._create_search, db, search_params)
+        search_id = search.id
+        hot_searches.record(search_params)
+        yield {"event": "search", "id": search_id, "created_at": search.created_at}
+        
+        # Scrapers hand over pages through page_sink; set for the scrape tasks only
+        pages = asyncio.Queue()
+        token = page_sink.set(lambda site, result_type, results: pages.put_nowait((site, result_type, results)))
+        try:
+            tasks = self._start_tasks(search_params)
+        finally:
+            page_sink.reset(token)
+        pending = set(tasks)
+        getter = None
+        flights, accommodations = [], []
+        # A hedged duplicate scrape streams the same listings again; send each once
+        sent = set()
+        
+        def results_event(site: str, result_type: str, results: List[ResultRecord], partial: bool) -> Dict[str, Any]:
+            fresh = []
+            for result in results:
+                key = (result.site, result.type, result.link, result.title, result.price)
+                if key not in sent:
+                    sent.add(key)
+                    fresh.append(result)
+            (flights if result_type == "flight" else accommodations).extend(fresh)
+            return {
+                "event": "results",
+                "site": site,
+                "type": result_type,
+                "partial": partial,
+                "results": fresh,
+                "best_flight": ranking.best_option(flights, "flight"),
+                "best_accommodation": ranking.best_option(accommodations, "accommodation")
+            }
+        
+        timed_out_sites = set()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.SEARCH_DEADLINE
+        try:
+            while pending:
+                if getter is None:
+                    getter = asyncio.ensure_future(pages.get())
+                done, _ = await asyncio.wait(
+                    pending | {getter},
+                    timeout=max(0, deadline - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Search deadline reached; report the stragglers and stop waiting
+                    for task in pending:
+                        site, result_type = tasks[task]
+                        timed_out_sites.add(site)
+                        yield {"event": "timeout", "site": site, "type": result_type}
+                    break
+                if getter in done:
+                    event = results_event(*getter.result(), partial=True)
+                    getter = None
+                    if event["results"]:
+                        yield event
+                finished = done & pending
+                pending -= finished
+                for task in finished:
+                    site, result_type = tasks[task]
+                    if isinstance(task.exception(), asyncio.TimeoutError):
+                        timed_out_sites.add(site)
+                        yield {"event": "timeout", "site": site, "type": result_type}
+                        continue
+                    if task.exception() is not None:
+                        if not isinstance(task.exception(), CircuitOpenError):
+                            print(f"Error during scraping: {task.exception()}")
+                        yield {"event": "error", "site": site, "type": result_type, "detail": str(task.exception())}
+                        continue
+                    
+                    yield results_event(site, result_type, task.result(), partial=False)
+        finally:
+            # The client may disconnect mid-stream; don't leave scrapers running
+            for task in pending:
+                task.cancel()
+            if getter is not None:
+                getter.cancel()
+            # Store whatever was already sent, so a search the client walked
+            # away from doesn't look finished with no results
+            await result_writer.enqueue(search_id, flights + accommodations)
+        
+        metrics.search_seconds.labels("stream").observe(time.perf_counter() - started)
+        yield {
+            "event": "done",
+            "id": search_id,
+            "total_found": len(flights) + len(accommodations),
+            "timed_out_sites": sorted(timed_out_sites)
+        }
+    
+    async def _scrape(self, scraper: BaseScraper, result_type: str, search_params: Dict[str, Any], cache_key: str) -> List[ResultRecord]:
+        cached, stale = await search_cache.lookup(cache_key, scraper.SITE_NAME, result_type)
+        if cached is not None:
+            # Serve stale results immediately and refresh them off the request path
+            if stale:
+                self._refresh_in_background(scraper, result_type, search_params, cache_key)
+            return cached
+        return await self._scrape_live(scraper, result_type, search_params, cache_key)
+    
+    async def _scrape_live(self, scraper: BaseScraper, result_type: str, search_params: Dict[str, Any], cache_key: str) -> List[ResultRecord]:
+        def fetch():
+            if result_type == "flight":
+                return scraper.search_flights(search_params)
+            return scraper.search_accommodations(search_params)
+        
+        # A site that keeps failing is skipped outright instead of retried on every search
+        breaker = circuit_breakers.get(scraper.SITE_NAME) if circuit_breakers.enabled else None
+        if breaker is not None:
+            breaker.acquire()
         
-        # Create features matrix
-        features = []
-        for option in options:
-            price = option["price"]
-            rating = option.get("rating", 0)
-            reviews = option.get("reviews_count", 0)
-            features.append([price, rating, reviews])
+        latency_key = f"{scraper.SITE_NAME}:{result_type}"
+        started = time.monotonic()
+        try:
+            # The site deadline is applied here rather than around the whole
+            # scrape, so running past it is a verdict the breaker sees, not a
+            # cancellation from outside
+            results = to_records(await asyncio.wait_for(
+                hedged(fetch, latency_tracker.hedge_delay(latency_key)),
+                timeout=site_deadline(scraper.SITE_NAME)
+            ), scraper.SITE_NAME)
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception as e:
+            if breaker is not None:
+                breaker.record_failure("timeout" if isinstance(e, asyncio.TimeoutError) else repr(e))
+            raise
+        latency_tracker.record(latency_key, time.monotonic() - started)
+        if breaker is not None:
+            if results or not settings.CIRCUIT_EMPTY_IS_FAILURE:
+                breaker.record_success()
+            else:
+                breaker.record_failure(f"no {result_type} results")
         
-        # Normalize features
-        scaler = MinMaxScaler()
-        normalized_features = scaler.fit_transform(features)
+        # Empty pages usually mean a block or a markup change, so they are not cached
+        if results:
+            await search_cache.set(cache_key, scraper.SITE_NAME, result_type, results)
+        return results
+    
+    async def _refresh(self, scraper: BaseScraper, result_type: str, search_params: Dict[str, Any], cache_key: str) -> bool:
+        # At most one refresh per cache entry at a time
+        try:
+            results = await inflight_refreshes.do(
+                (cache_key, scraper.SITE_NAME, result_type),
+                lambda: self._scrape_live(scraper, result_type, search_params, cache_key)
+            )
+        except Exception as e:
+            print(f"Error refreshing {scraper.SITE_NAME} {result_type}: {e!r}")
+            return False
+        return bool(results)
+    
+    def _refresh_in_background(self, scraper: BaseScraper, result_type: str, search_params: Dict[str, Any], cache_key: str):
+        # The refresh outlives the request, so it must not stream pages into it
+        token = page_sink.set(None)
+        try:
+            task = asyncio.create_task(self._refresh(scraper, result_type, search_params, cache_key))
+        finally:
+            page_sink.reset(token)
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
+    async def refresh_hot_searches(self, hot_searches: List[Dict[str, Any]]) -> int:
+        """
+        Re-scrape the given searches' sites whose cached results are missing or
+        expire within HOT_REFRESH_MARGIN. Returns how many entries were refreshed.
+        """
+        scrapers = {scraper.SITE_NAME: scraper for scraper in self.scrapers}
+        refreshes = []
+        for search_params in hot_searches:
+            cache_key = search_key(search_params)
+            plan, _ = self.plan(search_params)
+            for site, result_type in plan:
+                if not circuit_breakers.available(site):
+                    continue
+                remaining = search_cache.expires_in(cache_key, site, result_type)
+                if remaining is None or remaining <= settings.HOT_REFRESH_MARGIN:
+                    refreshes.append(self._refresh(scrapers[site], result_type, search_params, cache_key))
+        results = await asyncio.gather(*refreshes)
+        return sum(results)
+    
+    @staticmethod
+    def _split(results: List[ResultRecord]) -> Tuple[List[ResultRecord], List[ResultRecord]]:
+        """(flights, accommodations) in one pass."""
+        flights, accommodations = [], []
+        for result in results:
+            if result.type == "flight":
+                flights.append(result)
+            elif result.type == "accommodation":
+                accommodations.append(result)
+        return flights, accommodations
+    
+    async def _process_results(self, search_id: int, results: List[ResultRecord], store: bool = True) -> Dict[str, Any]:
+        # Hand results to the write-behind queue; the response doesn't wait for the INSERTs
+        if store:
+            await result_writer.enqueue(search_id, results)
         
-        # Calculate scores (lower price is better, higher rating and reviews are better)
-        scores = normalized_features[:, 0] * -0.5 + normalized_features[:, 1] * 0.3 + normalized_features[:, 2] * 0.2
+        # Order each result type best first using the scoring system
+        flights, accommodations = self._split(results)
+        started = time.perf_counter()
+        flights = ranking.top_k(flights, "flight")
+        ranked = time.perf_counter()
+        accommodations = ranking.top_k(accommodations, "accommodation")
+        metrics.ranking_seconds.labels("flight").observe(ranked - started)
+        metrics.ranking_seconds.labels("accommodation").observe(time.perf_counter() - ranked)
         
-        # Return option with best score
-        best_index = np.argmax(scores)
-        return options[best_index]
\ No newline at end of file
+        return {
+            "flights": flights,
+            "accommodations": accommodations,
+            "best_flight": flights[0] if flights else None,
+            "best_accommodation": accommodations[0] if accommodations else None
+        }
\ No newline at end of file
@@ -0,0 +1,50 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls: callers asking for the same key while a call
+    is in flight await that call's result instead of starting their own. The
+    call is cancelled once every caller waiting on it has given up.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Callers still awaiting each in-flight call
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.started = 0
+        self.joined = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.started += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.joined += 1
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # A caller that is cancelled (deadline, disconnect) must not cancel the others
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Nobody wants the result any more; stop the work so it frees its
+                    # rate limit slot and connection, and let the next caller start afresh
+                    if self._inflight.get(key) is task:
+                        del self._inflight[key]
+                    task.cancel()
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Retrieve the exception so it isn't logged when every caller gave up
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"inflight": len(self._inflight), "started": self.started, "joined": self.joined}
\ No newline at end of file
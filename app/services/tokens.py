@@ -0,0 +1,88 @@
+from typing import Any, Dict, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import hashlib
+import time
+from jose import JWTError, jwt as jose_jwt
+from ..config import settings
+
+try:
+    import jwt as pyjwt
+except ImportError:  # PyJWT is optional
+    pyjwt = None
+
+# Errors either library raises for a bad signature, malformed token or expired exp
+DECODE_ERRORS = (JWTError,) + ((pyjwt.PyJWTError,) if pyjwt is not None else ())
+
+class InvalidTokenError(Exception):
+    pass
+
+def jwt_backend() -> str:
+    """The JWT library in use: JWT_BACKEND, with "auto" preferring PyJWT when installed."""
+    if settings.JWT_BACKEND == "auto":
+        return "pyjwt" if pyjwt is not None else "jose"
+    if settings.JWT_BACKEND == "pyjwt" and pyjwt is None:
+        raise RuntimeError("JWT_BACKEND is \"pyjwt\" but PyJWT is not installed")
+    return settings.JWT_BACKEND
+
+def encode_token(claims: Dict[str, Any]) -> str:
+    to_encode = claims.copy()
+    to_encode["exp"] = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    if jwt_backend() == "pyjwt":
+        return pyjwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jose_jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Verify the signature and expiry of a token and return its claims."""
+    try:
+        if jwt_backend() == "pyjwt":
+            return pyjwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        return jose_jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except DECODE_ERRORS as e:
+        raise InvalidTokenError(str(e)) from e
+
+class TokenCache:
+    """
+    Claims of already verified tokens, keyed by the token's SHA-256 so raw
+    tokens are never held in memory. Entries expire with the token's `exp`
+    and the least recently used are evicted past TOKEN_CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Claims of a valid token, decoding it only on a cache miss."""
+        if settings.TOKEN_CACHE_MAX_ENTRIES <= 0:
+            return decode_token(token)
+
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        self.misses += 1
+        claims = decode_token(token)
+        if "exp" in claims:
+            self._entries[key] = (float(claims["exp"]), claims)
+            while len(self._entries) > settings.TOKEN_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+        return claims
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "backend": jwt_backend()}
+
+token_cache = TokenCache()
\ No newline at end of file
@@ -0,0 +1,65 @@
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+from sqlalchemy import event
+from ..config import settings
+from ..models import User
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """The fields of a User that requests need, safe to share between requests and threads."""
+    id: int
+    email: str
+    is_active: bool
+
+    @classmethod
+    def from_model(cls, user: User) -> "AuthenticatedUser":
+        return cls(id=user.id, email=user.email, is_active=bool(user.is_active))
+
+class UserCache:
+    """
+    Recently authenticated users by id, so most requests skip the users
+    table. Entries live USER_CACHE_TTL seconds, which bounds how long
+    another process takes to notice a change; changes made through the ORM
+    in this process invalidate the entry at once.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[int, Tuple[float, AuthenticatedUser]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[AuthenticatedUser]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, user: AuthenticatedUser):
+        if settings.USER_CACHE_TTL <= 0:
+            return
+        self._entries[user.id] = (time.monotonic() + settings.USER_CACHE_TTL, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > settings.USER_CACHE_MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+user_cache = UserCache()
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User):
+    user_cache.invalidate(target.id)
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Scrape worker: claims per-site jobs from the job queue, runs the scrapers and
+stores their results. Run as many as needed, on any host that can reach the
+database:
+
+    JOB_BACKEND=database python -m app.worker --concurrency 10
+
+The API process can also run workers itself (EMBEDDED_WORKERS).
+"""
+from typing import Any, Dict, Optional, Set
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from .config import settings
+from .database import run_db
+from .scrapers.http_client import http_client
+from .scrapers.parsing import shutdown_parser_pool
+from .services.cache import search_cache
+from .services.circuit_breaker import CircuitOpenError
+from .services.jobs import CIRCUIT_OPEN_ERROR, ClaimedJob, JobQueue, TIMEOUT_ERROR, get_job_queue
+from .services.search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+class ScrapeWorker:
+    """Polls the job queue and scrapes up to `concurrency` jobs at a time."""
+
+    def __init__(self, queue: JobQueue, service: SearchService, concurrency: Optional[int] = None):
+        self.queue = queue
+        self.service = service
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.name = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self.jobs_done = 0
+        self.jobs_failed = 0
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop claiming, cancel jobs in progress and hand them back to the queue."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        claimed = {}
+        try:
+            while True:
+                free = self.concurrency - len(self._running)
+                jobs = []
+                if free > 0:
+                    try:
+                        jobs = await run_db(self.queue.claim, self.name, free)
+                    except Exception:
+                        logger.exception("Could not claim scrape jobs")
+                for job in jobs:
+                    task = asyncio.create_task(self._process(job))
+                    claimed[task] = job
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+                    task.add_done_callback(lambda task: claimed.pop(task, None))
+                if not jobs:
+                    await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+        finally:
+            for task in self._running:
+                task.cancel()
+            unfinished = list(claimed.values())
+            if unfinished:
+                await asyncio.gather(*self._running, return_exceptions=True)
+                await run_db(self.queue.release, unfinished)
+
+    async def _process(self, job: ClaimedJob):
+        try:
+            results = await self.service.scrape_site(job.site, job.result_type, job.params)
+        except asyncio.TimeoutError:
+            # A site that blew its deadline once is unlikely to make it on a retry
+            await run_db(self.queue.fail, job, TIMEOUT_ERROR, False)
+            self.jobs_failed += 1
+            return
+        except CircuitOpenError:
+            # Retrying before the cool-down passes would only be rejected again
+            await run_db(self.queue.fail, job, CIRCUIT_OPEN_ERROR, False)
+            self.jobs_failed += 1
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error scraping {job.site} {job.result_type}: {e!r}")
+            await run_db(self.queue.fail, job, repr(e))
+            self.jobs_failed += 1
+            return
+        await run_db(self.queue.complete, job, results)
+        self.jobs_done += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker": self.name,
+            "running": len(self._running),
+            "concurrency": self.concurrency,
+            "jobs_done": self.jobs_done,
+            "jobs_failed": self.jobs_failed,
+        }
+
+async def serve(concurrency: int):
+    queue = get_job_queue()
+    if queue is None:
+        raise SystemExit("JOB_BACKEND is \"inline\"; set it to a queue backend such as \"database\"")
+
+    await http_client.start()
+    worker = ScrapeWorker(queue, SearchService(), concurrency)
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    await worker.start()
+    logger.info("Worker %s polling %s job queue", worker.name, settings.JOB_BACKEND)
+    try:
+        await stopping.wait()
+    finally:
+        await worker.stop()
+        await http_client.close()
+        shutdown_parser_pool()
+        search_cache.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a scrape worker")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(args.concurrency))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
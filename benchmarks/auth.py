@@ -0,0 +1,76 @@
+"""
+Per-request cost of authenticating a bearer token.
+
+Compares the old path (python-jose decode plus a users table query on every
+request) with the token and user caches, cold and warm, for each available
+JWT backend. Uses a throwaway SQLite database unless DATABASE_URL is set.
+
+    python -m benchmarks.auth --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:////tmp/benchmark_auth.sqlite")
+
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.models import User
+from app.routers import auth
+from app.services import tokens
+from app.services.tokens import token_cache
+from app.services.user_cache import user_cache
+
+async def legacy(token: str, db):
+    # The pre-cache implementation: decode with python-jose and look the user up by email
+    payload = tokens.jose_jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    return db.query(User).filter(User.email == payload["sub"]).first()
+
+async def cold(token: str, db):
+    token_cache.clear()
+    user_cache.clear()
+    return await auth.get_current_user(token, db)
+
+async def warm(token: str, db):
+    return await auth.get_current_user(token, db)
+
+async def measure(func, token: str, db, requests: int) -> float:
+    await func(token, db)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await func(token, db)
+    return (time.perf_counter() - started) / requests
+
+async def run(requests: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = db.query(User).filter(User.email == "bench@example.com").first()
+    if user is None:
+        user = User(email="bench@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
+    backends = ["jose"] + (["pyjwt"] if tokens.pyjwt is not None else [])
+    print(f"{'path':<32} {'per request':>12}")
+    try:
+        for backend in backends:
+            settings.JWT_BACKEND = backend
+            token = auth.create_access_token(auth.user_claims(user))
+            if backend == "jose":
+                print(f"{'legacy (decode + query)':<32} {await measure(legacy, token, db, requests) * 1e6:>9.1f} us")
+            print(f"{backend + ' cold caches':<32} {await measure(cold, token, db, requests) * 1e6:>9.1f} us")
+            print(f"{backend + ' warm caches':<32} {await measure(warm, token, db, requests) * 1e6:>9.1f} us")
+    finally:
+        db.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.requests))
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Event-loop latency under concurrent searches, with DB calls inline vs offloaded.
+
+Runs SearchService.search_all with fake scrapers (no network) while a ticker
+task measures how late the event loop wakes it up. Every search has its own
+destination, so identical in-flight searches aren't merged into one fan-out.
+A per-statement delay emulates a remote database round-trip. Uses a throwaway SQLite database unless
+DATABASE_URL points at a scratch database.
+
+    python -m benchmarks.event_loop_lag --searches 40 --concurrency 10 --db-latency 0.001
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "event_loop_lag.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+os.environ["CACHE_ENABLED"] = "false"
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.scrapers.base import BaseScraper
+from app.services.search_service import SearchService
+
+class FakeScraper(BaseScraper):
+    def __init__(self, site: str, items: int):
+        super().__init__()
+        self.SITE_NAME = site
+        self.items = items
+
+    def _results(self, result_type):
+        return [{
+            "site": self.SITE_NAME,
+            "type": result_type,
+            "title": f"{self.SITE_NAME} option {i}",
+            "price": 100.0 + i,
+            "currency": "USD",
+            "link": f"https://example.com/{i}",
+            "description": "benchmark",
+            "rating": 4.0,
+            "reviews_count": i,
+        } for i in range(self.items)]
+
+    async def search_accommodations(self, params):
+        await asyncio.sleep(0.05)
+        return self._results("accommodation")
+
+    async def search_flights(self, params):
+        await asyncio.sleep(0.05)
+        return self._results("flight")
+
+def search_params(i: int) -> dict:
+    return {
+        "destination": f"City{i}",
+        "start_date": datetime(2025, 1, 10),
+        "end_date": datetime(2025, 1, 15),
+        "guests": 2,
+        "budget": 1000.0,
+        "origin": "Buenos Aires",
+    }
+
+async def measure_lag(stop: asyncio.Event, samples: list, interval: float = 0.001):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+async def run(offload: bool, searches: int, concurrency: int, items: int):
+    settings.DB_OFFLOAD = offload
+    service = SearchService()
+    service.scrapers = [FakeScraper(f"site{i}", items) for i in range(5)]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_search(i: int):
+        async with semaphore:
+            db = SessionLocal()
+            started = time.perf_counter()
+            try:
+                await service.search_all(db, search_params(i))
+            finally:
+                db.close()
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    lag = []
+    ticker = asyncio.create_task(measure_lag(stop, lag))
+    started = time.perf_counter()
+    await asyncio.gather(*(one_search(i) for i in range(searches)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    lag.sort()
+    latencies.sort()
+    pct = lambda data, p: data[min(len(data) - 1, int(p / 100 * len(data)))] * 1000
+    print(
+        f"{'offloaded' if offload else 'inline':>9}: "
+        f"{searches / elapsed:7.1f} searches/s  "
+        f"search p50 {pct(latencies, 50):7.1f} ms  p99 {pct(latencies, 99):7.1f} ms  "
+        f"loop lag p50 {pct(lag, 50):6.2f} ms  p99 {pct(lag, 99):6.2f} ms  max {lag[-1] * 1000:6.2f} ms  "
+        f"mean {statistics.mean(lag) * 1000:5.2f} ms"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--searches", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--items", type=int, default=10, help="results per site and result type")
+    parser.add_argument("--db-latency", type=float, default=0.001, help="seconds added to every SQL statement")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    if args.db_latency:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _round_trip(*_):
+            time.sleep(args.db_latency)
+
+    for offload in (False, True):
+        asyncio.run(run(offload, args.searches, args.concurrency, args.items))
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Synthetic result pages shaped like each site's markup.
+
+The generated pages match the selectors the scrapers use and are padded with
+scripts, navigation and decorative markup so their size and DOM weight look
+like real multi-hundred-KB result pages. Real pages saved from a browser can
+be used instead by putting them in a directory as <site>_<type>.html.
+
+    python -m benchmarks.fixtures --out benchmarks/.fixtures --items 50
+"""
+import argparse
+import os
+import random
+import sys
+
+SITES = ("booking", "airbnb", "kayak", "expedia", "despegar")
+FIXTURES = (
+    ("booking", "accommodation"),
+    ("airbnb", "accommodation"),
+    ("kayak", "accommodation"),
+    ("kayak", "flight"),
+    ("expedia", "accommodation"),
+    ("expedia", "flight"),
+    ("despegar", "accommodation"),
+    ("despegar", "flight"),
+)
+
+AIRLINES = ("Aerolineas Argentinas", "LATAM", "Flybondi", "JetSMART", "GOL", "Copa")
+
+def _decoration(rng: random.Random, depth: int = 4) -> str:
+    # Nested badges/icons that real cards carry but the scrapers never read
+    inner = "".join(
+        f'<span class="badge-{rng.randint(0, 999)}" aria-hidden="true"><svg viewBox="0 0 24 24"><path d="M{rng.randint(0, 24)} 0L24 24"/></svg></span>'
+        for _ in range(3)
+    )
+    for level in range(depth):
+        inner = f'<div class="decor-{level}" data-track="{rng.getrandbits(32):x}">{inner}</div>'
+    return inner
+
+def _price(rng: random.Random, style: str) -> str:
+    amount = rng.uniform(30, 4000)
+    whole, cents = int(amount), int(round((amount - int(amount)) * 100)) % 100
+    if style == "en":
+        return f"$ {whole:,}"
+    return f"$ {whole:,}".replace(",", ".") + f",{cents:02d}"
+
+def _card(site: str, result_type: str, i: int, rng: random.Random) -> str:
+    decor = _decoration(rng)
+    if result_type == "flight":
+        airline = rng.choice(AIRLINES)
+        stops = rng.choice(("Directo", "1 escala", "2 escalas"))
+        duration = f"{rng.randint(1, 20)}h {rng.randint(0, 59)}m"
+        if site == "kayak":
+            return (
+                f'<div class="FlightResultCard-{i} nrc6"><div class="AirlineName">{airline}</div>'
+                f'<div class="Duration">{duration}</div><div class="Stops">{stops}</div>{decor}'
+                f'<div class="Price-text">{_price(rng, "es")}</div><a href="/flights/book/{i}">Ver</a></div>'
+            )
+        if site == "expedia":
+            return (
+                f'<li data-test-id="flight-card"><span data-test-id="airline-name">{airline}</span>'
+                f'<span data-test-id="duration">{duration}</span><span data-test-id="stops">{stops}</span>{decor}'
+                f'<span data-test-id="price-text">{_price(rng, "es")}</span>'
+                f'<a data-test-id="select-link" href="/Flights-Details/{i}">Select</a></li>'
+            )
+        return (
+            f'<div class="cluster-container"><span class="airline-name">{airline}</span>'
+            f'<span class="duration">{duration}</span><span class="stops-text">{stops}</span>{decor}'
+            f'<span class="price-amount">{_price(rng, "es")}</span><a class="flight-link" href="/vuelos/{i}">Comprar</a></div>'
+        )
+
+    title = f"Hotel {rng.choice(('Plaza', 'Centro', 'Del Lago', 'Andino', 'Boutique'))} {i}"
+    image = f"https://images.example.com/{site}/{i}.jpg"
+    if site == "booking":
+        return (
+            f'<div data-testid="property-card"><a href="/hotel/ar/property-{i}.html"><img src="{image}"></a>'
+            f'<div data-testid="title">{title}</div>{decor}<div data-testid="rating-score">{rng.uniform(5, 10):.1f}</div>'
+            f'<span data-testid="price-and-discounted-price">{_price(rng, "en")}</span></div>'
+        )
+    if site == "airbnb":
+        return (
+            f'<div data-testid="card-container"><a href="/rooms/{i}"><img src="{image}"></a>'
+            f'<div data-testid="listing-card-title">{title}</div>{decor}'
+            f'<span data-testid="rating">{rng.uniform(3, 5):.2f} ({rng.randint(1, 900)})</span>'
+            f'<span data-testid="price-element">{_price(rng, "es")}</span></div>'
+        )
+    if site == "kayak":
+        return (
+            f'<div class="HotelResultCard-{i} yuAt"><a href="/hotels/{i}"><img src="{image}"></a>'
+            f'<div class="HotelName">{title}</div>{decor}<div class="ReviewScore">{rng.uniform(5, 10):.1f}/10</div>'
+            f'<div class="PropertyCardPrice">{_price(rng, "es")}</div></div>'
+        )
+    if site == "expedia":
+        return (
+            f'<div data-stid="property-listing"><img src="{image}"><h3 data-stid="property-name">{title}</h3>{decor}'
+            f'<span data-stid="property-rating">{rng.uniform(5, 10):.1f}/10</span>'
+            f'<div data-stid="price-lockup">{_price(rng, "es")}</div>'
+            f'<a data-stid="open-hotel-details" href="/Hotel-Information/{i}">Ver</a></div>'
+        )
+    return (
+        f'<div class="results-cluster-container"><div class="accommodation-image"><img src="{image}"></div>'
+        f'<span class="accommodation-name">{title}</span>{decor}<span class="rating-text">{rng.uniform(5, 10):.1f}/10</span>'
+        f'<span class="price-amount">{_price(rng, "es")}</span><a class="accommodation-link" href="/hoteles/h-{i}">Ver</a></div>'
+    )
+
+def render(site: str, result_type: str, items: int = 50, page_kb: int = 300, seed: int = 0, start: int = 0) -> str:
+    """
+    Build a result page for site/result_type with `items` listings, padded to
+    about page_kb. Listings are numbered from start, so later pages link elsewhere.
+    """
+    rng = random.Random(f"{site}:{result_type}:{seed}")
+    cards = "".join(_card(site, result_type, i, rng) for i in range(start, start + items))
+    head = (
+        f"<!DOCTYPE html><html><head><title>{site} results</title>"
+        "<style>" + ".x{color:red}" * 200 + "</style></head><body>"
+        "<nav>" + "".join(f'<a href="/nav/{i}">Menu {i}</a>' for i in range(60)) + "</nav><main>"
+    )
+    tail = "</main><footer>" + "".join(f"<p>Legal {i}</p>" for i in range(40)) + "</footer>"
+    padding = []
+    size = len(head) + len(cards) + len(tail)
+    while size < page_kb * 1024:
+        # Inline state blobs and hidden recommendation blocks, as real pages ship
+        chunk = (
+            f'<script type="application/json">{{"state":"{rng.getrandbits(256):x}","items":[{",".join(str(rng.random()) for _ in range(20))}]}}</script>'
+            f'<div class="recommendation" hidden>{_decoration(rng, 3)}</div>'
+        )
+        padding.append(chunk)
+        size += len(chunk)
+    return head + cards + tail + "".join(padding) + "</body></html>"
+
+def fixture_path(directory: str, site: str, result_type: str, page: int = 0) -> str:
+    # Later result pages are saved as <site>_<type>_2.html, _3.html, ...
+    suffix = f"_{page + 1}" if page else ""
+    return os.path.join(directory, f"{site}_{result_type}{suffix}.html")
+
+def load_or_render(directory: str, site: str, result_type: str, items: int = 50, page_kb: int = 300, page: int = 0) -> str:
+    """Read a saved fixture if there is one, otherwise generate it."""
+    path = fixture_path(directory, site, result_type, page) if directory else None
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    return render(site, result_type, items, page_kb, seed=page, start=page * items)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), ".fixtures"))
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--page-kb", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    for site, result_type in FIXTURES:
+        path = fixture_path(args.out, site, result_type)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render(site, result_type, args.items, args.page_kb))
+        print(f"wrote {path} ({os.path.getsize(path) // 1024} KiB)")
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+Load test of the real scrapers against the local stand-in server.
+
+Starts benchmarks.standin in-process, points every scraper at it with
+SCRAPER_BASE_URLS and runs --searches searches at each --concurrency level,
+either straight through SearchService.search_all ("service") or as
+authenticated POST /search/ requests to the app served by uvicorn on a
+local port ("endpoint"), or both. Everything (fetching, parsing, ranking,
+DB writes) runs for real except the sites themselves; no network access is
+needed. Reports throughput, p50/p95/p99 latency, failed searches and the
+process's resident memory (parser pool processes not included).
+
+Rate limiting is off (SCRAPING_DELAY=0) unless --rate-limit is given, since
+every site shares the stand-in's host. Searches use distinct destinations so
+identical in-flight searches aren't deduplicated; pass --same-params to
+measure that path instead. Uses a throwaway SQLite database unless
+DATABASE_URL points at a scratch database.
+
+    python -m benchmarks.load --target both --searches 50 --concurrency 1 10 25 --latency 0.3
+"""
+import argparse
+import asyncio
+import os
+import resource
+import socket
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "load.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+os.environ["CACHE_ENABLED"] = "false"
+
+import aiohttp
+
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.models import User
+from app.scrapers.http_client import http_client
+from app.services.passwords import pwd_context
+from app.services.result_writer import result_writer
+from app.services.search_service import SearchService
+
+from .standin import add_arguments, from_arguments
+
+EMAIL = "load@example.com"
+
+def params_for(i: int, same: bool) -> dict:
+    return {
+        "destination": "Bariloche" if same else f"City{i}",
+        "start_date": datetime(2025, 1, 10),
+        "end_date": datetime(2025, 1, 15),
+        "guests": 2,
+        "budget": 1000.0,
+        "origin": "Buenos Aires",
+    }
+
+def rss_mib() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return float("nan")
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+def report(target: str, concurrency: int, latencies: list, failures: int, found: int, elapsed: float):
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000 if latencies else float("nan")
+    completed = len(latencies)
+    print(
+        f"{target:>8} c={concurrency:<3} {completed / elapsed:7.2f} searches/s  "
+        f"p50 {pct(50):8.1f} ms  p95 {pct(95):8.1f} ms  p99 {pct(99):8.1f} ms  "
+        f"failed {failures:>3}  results/search {found / completed if completed else 0:6.1f}  "
+        f"rss {rss_mib():6.1f} MiB  peak {peak_rss_mib():6.1f} MiB",
+        flush=True
+    )
+
+async def run_level(one_search, searches: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    outcome = {"failed": 0, "found": 0}
+
+    async def timed(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                found = await one_search(i)
+            except Exception as e:
+                outcome["failed"] += 1
+                print(f"search {i} failed: {e!r}")
+                return
+            latencies.append(time.perf_counter() - started)
+            outcome["found"] += found
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(searches)))
+    return latencies, outcome["failed"], outcome["found"], time.perf_counter() - started
+
+async def load_service(args):
+    service = SearchService()
+    offset = 0
+
+    async def one_search(i: int) -> int:
+        db = SessionLocal()
+        try:
+            result = await service.search_all(db, params_for(offset + i, args.same_params))
+        finally:
+            db.close()
+        return result["total_found"]
+
+    await http_client.start()
+    await result_writer.start()
+    try:
+        for concurrency in args.concurrency:
+            report("service", concurrency, *await run_level(one_search, args.searches, concurrency))
+            offset += args.searches
+    finally:
+        await result_writer.stop()
+
+def ensure_user() -> str:
+    from app.routers.auth import create_access_token, user_claims
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == EMAIL).first()
+        if user is None:
+            user = User(email=EMAIL, hashed_password=pwd_context.hash("load test"), is_active=True)
+            db.add(user)
+            db.commit()
+        return create_access_token(user_claims(user))
+    finally:
+        db.close()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def load_endpoint(args):
+    import uvicorn
+    from app.main import app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="on", log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            return serving.result()
+        await asyncio.sleep(0.05)
+
+    headers = {"Authorization": f"Bearer {ensure_user()}"}
+    url = f"http://127.0.0.1:{port}/search/"
+    offset = 0
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=settings.SEARCH_DEADLINE + 60)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            async def one_search(i: int) -> int:
+                body = params_for(offset + i, args.same_params)
+                body = {**body, "start_date": body["start_date"].isoformat(), "end_date": body["end_date"].isoformat()}
+                async with session.post(url, json=body) as response:
+                    if response.status != 200:
+                        raise Exception(f"HTTP {response.status}: {(await response.text())[:200]}")
+                    return (await response.json())["total_found"]
+
+            for concurrency in args.concurrency:
+                report("endpoint", concurrency, *await run_level(one_search, args.searches, concurrency))
+                offset += args.searches
+    finally:
+        server.should_exit = True
+        await serving
+
+async def run(args):
+    standin = from_arguments(args)
+    settings.SCRAPER_BASE_URLS = await standin.start()
+    if not args.rate_limit:
+        settings.SCRAPING_DELAY = 0
+    try:
+        if args.target in ("service", "both"):
+            await load_service(args)
+        # Last: the app lifespan shuts down the shared pools when it ends
+        if args.target in ("endpoint", "both"):
+            await load_endpoint(args)
+    finally:
+        await http_client.close()
+        await standin.stop()
+    stats = standin.stats()
+    print(
+        f"stand-in served {stats['requests']} requests, {stats['errors']} errors, "
+        f"{stats['bytes_sent'] / 2**20:.1f} MiB"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("service", "endpoint", "both"), default="both")
+    parser.add_argument("--searches", type=int, default=50, help="searches per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 25])
+    parser.add_argument("--same-params", action="store_true", help="send identical searches")
+    parser.add_argument("--rate-limit", action="store_true", help="keep the per-domain rate limit")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Search latency while a storm of logins hashes passwords.
+
+Runs SearchService.search_all with fake scrapers (no network) alone, then
+alongside concurrent logins with bcrypt on the event loop
+(PASSWORD_HASH_WORKERS=0) and in the bounded hashing pool. With hashing
+offloaded, search latency should stay close to the baseline while excess
+logins are turned away with 503. Searches use distinct destinations so they
+aren't merged into one fan-out. Uses a throwaway SQLite database unless
+DATABASE_URL points at a scratch database; set BCRYPT_ROUNDS to change the
+hashing cost.
+
+    python -m benchmarks.login_storm --searches 40 --logins 200 --login-concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "login_storm.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+os.environ["CACHE_ENABLED"] = "false"
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.models import User
+from app.routers import auth
+from app.services.passwords import password_hasher, pwd_context
+from app.services.search_service import SearchService
+from benchmarks.event_loop_lag import FakeScraper, search_params
+
+EMAIL = "storm@example.com"
+PASSWORD = "correct horse battery staple"
+
+def ensure_user():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.email == EMAIL).first() is None:
+            db.add(User(email=EMAIL, hashed_password=pwd_context.hash(PASSWORD), is_active=True))
+            db.commit()
+    finally:
+        db.close()
+
+async def login_storm(logins: int, concurrency: int, outcomes: dict):
+    semaphore = asyncio.Semaphore(concurrency)
+    form = SimpleNamespace(username=EMAIL, password=PASSWORD)
+
+    async def one_login():
+        async with semaphore:
+            db = SessionLocal()
+            try:
+                await auth.login_for_access_token(form, db)
+                outcomes["ok"] += 1
+            except HTTPException as e:
+                outcomes[e.status_code] = outcomes.get(e.status_code, 0) + 1
+            finally:
+                db.close()
+
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+
+async def run(label: str, workers: int, args):
+    settings.PASSWORD_HASH_WORKERS = workers
+    password_hasher.shutdown()
+    service = SearchService()
+    service.scrapers = [FakeScraper(f"site{i}", 10) for i in range(5)]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one_search(i: int):
+        async with semaphore:
+            db = SessionLocal()
+            started = time.perf_counter()
+            try:
+                await service.search_all(db, search_params(i))
+            finally:
+                db.close()
+            latencies.append(time.perf_counter() - started)
+
+    outcomes = {"ok": 0}
+    storm = asyncio.create_task(login_storm(args.logins, args.login_concurrency, outcomes)) if label != "baseline" else None
+    started = time.perf_counter()
+    await asyncio.gather(*(one_search(i) for i in range(args.searches)))
+    searching = time.perf_counter() - started
+    if storm is not None:
+        await storm
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda data, p: data[min(len(data) - 1, int(p / 100 * len(data)))] * 1000
+    logins = f"{outcomes['ok'] / elapsed:6.1f} logins/s  rejected {outcomes.get(503, 0):4d}" if storm is not None else ""
+    print(
+        f"{label:>9}: {args.searches / searching:6.1f} searches/s  "
+        f"search p50 {pct(latencies, 50):7.1f} ms  p95 {pct(latencies, 95):7.1f} ms  max {latencies[-1] * 1000:7.1f} ms  "
+        f"{logins}"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--searches", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--login-concurrency", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    ensure_user()
+    print(f"bcrypt rounds {settings.BCRYPT_ROUNDS}, hashing workers {settings.PASSWORD_HASH_WORKERS}, max pending {settings.PASSWORD_HASH_MAX_PENDING}")
+    workers = settings.PASSWORD_HASH_WORKERS
+    asyncio.run(run("baseline", workers, args))
+    asyncio.run(run("inline", 0, args))
+    asyncio.run(run("offloaded", workers, args))
+    password_hasher.shutdown()
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
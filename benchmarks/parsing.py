@@ -0,0 +1,84 @@
+"""
+Parse time and peak memory per site: html.parser (the old default) vs lxml,
+with and without SoupStrainer partial parsing.
+
+Runs the extractor with each scraper's listing spec over saved or generated fixtures
+(see benchmarks/fixtures.py). Peak memory is Python allocations as seen by
+tracemalloc, which covers the BeautifulSoup tree but not lxml's C buffers.
+
+    python -m benchmarks.parsing --fixtures benchmarks/.fixtures --repeat 5
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from app.config import settings
+from app.scrapers import extractor
+from app.scrapers.airbnb import AirbnbScraper
+from app.scrapers.booking import BookingScraper
+from app.scrapers.despegar import DespegarScraper
+from app.scrapers.expedia import ExpediaScraper
+from app.scrapers.kayak import KayakScraper
+
+from .fixtures import FIXTURES, load_or_render
+
+SCRAPERS = {
+    "booking": BookingScraper,
+    "airbnb": AirbnbScraper,
+    "kayak": KayakScraper,
+    "expedia": ExpediaScraper,
+    "despegar": DespegarScraper,
+}
+
+@contextmanager
+def variant(parser: str, strain: bool):
+    saved = (settings.HTML_PARSER, extractor.strainer_for)
+    settings.HTML_PARSER = parser
+    if not strain:
+        extractor.strainer_for = lambda selector: None
+    try:
+        yield
+    finally:
+        settings.HTML_PARSER, extractor.strainer_for = saved
+
+def measure(func, html: str, repeat: int):
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = len(func(html))
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=None, help="directory of <site>_<type>.html pages")
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--page-kb", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    variants = [("html.parser", False), ("lxml", False), ("lxml", True)]
+    print(f"{'fixture':<24} {'size':>8}  {'variant':<20} {'items':>5} {'best time':>11} {'peak mem':>11}")
+    for site, result_type in FIXTURES:
+        html = load_or_render(args.fixtures, site, result_type, args.items, args.page_kb)
+        scraper = SCRAPERS[site]
+        spec = scraper.FLIGHTS if result_type == "flight" else scraper.ACCOMMODATIONS
+        func = lambda page: extractor.extract(spec, page, scraper.BASE_URL, scraper.SITE_NAME)
+        for parser_name, strain in variants:
+            with variant(parser_name, strain):
+                seconds, peak, count = measure(func, html, args.repeat)
+            label = parser_name + (" + strainer" if strain else "")
+            print(
+                f"{site + ':' + result_type:<24} {len(html) // 1024:>5} KiB  {label:<20} {count:>5} "
+                f"{seconds * 1000:>8.1f} ms {peak / 1024 / 1024:>8.1f} MiB"
+            )
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
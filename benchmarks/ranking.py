@@ -0,0 +1,91 @@
+"""
+Ranking engine vs the previous MinMaxScaler-based _find_best_option.
+
+    python -m benchmarks.ranking --sizes 10 1000 100000
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.records import ResultRecord
+from app.services import ranking
+
+def legacy_find_best_option(options):
+    # The implementation that lived in SearchService before the ranking module
+    from sklearn.preprocessing import MinMaxScaler
+
+    features = []
+    for option in options:
+        price = option["price"]
+        rating = option.get("rating", 0)
+        reviews = option.get("reviews_count", 0)
+        features.append([price, rating, reviews])
+    scaler = MinMaxScaler()
+    normalized_features = scaler.fit_transform(features)
+    scores = normalized_features[:, 0] * -0.5 + normalized_features[:, 1] * 0.3 + normalized_features[:, 2] * 0.2
+    return options[np.argmax(scores)]
+
+def make_options(n: int, missing: float = 0.0):
+    rng = random.Random(n)
+    options = []
+    for i in range(n):
+        options.append(ResultRecord(
+            site="Booking.com",
+            type="accommodation",
+            price=rng.uniform(20, 2000),
+            currency="USD",
+            title=f"Option {i}",
+            description=f"Option {i}",
+            link=f"https://example.com/{i}",
+            rating=None if rng.random() < missing else rng.uniform(1, 10),
+            reviews_count=None if rng.random() < missing else rng.randint(0, 5000),
+        ))
+    return options
+
+def timed(func, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    try:
+        import sklearn  # noqa: F401
+        has_sklearn = True
+    except ImportError:
+        has_sklearn = False
+        print("scikit-learn not installed; skipping the legacy implementation")
+
+    print(f"{'options':>8}  {'implementation':<22} {'best time':>12} {'peak alloc':>12}")
+    for size in args.sizes:
+        # The legacy scorer cannot handle missing ratings, so it gets complete data
+        options = make_options(size)
+        dicts = [option.to_dict() for option in options]
+        runs = [
+            ("ranking.best_option", lambda: ranking.best_option(options, "accommodation")),
+            ("ranking.top_k(k=10)", lambda: ranking.top_k(options, "accommodation", 10)),
+            ("ranking.rank (full)", lambda: ranking.rank(options, "accommodation")),
+        ]
+        if has_sklearn:
+            runs.insert(0, ("legacy MinMaxScaler", lambda: legacy_find_best_option(dicts)))
+        for name, func in runs:
+            seconds, peak = timed(func, args.repeat)
+            print(f"{size:>8}  {name:<22} {seconds * 1000:>9.3f} ms {peak / 1024:>9.1f} KiB")
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Per-search cost of carrying results as dicts vs ResultRecords.
+
+For a search returning --results results, times the work around ranking
+(which is the same numpy code either way) and measures allocations:
+
+  dicts    the previous pipeline: filter the dicts once per result type,
+           build INSERT rows from them, then validate the response through
+           the SearchResponse schema and JSON-encode it as FastAPI does
+  records  validate each dict into a ResultRecord once, split by type in
+           one pass, build INSERT rows and serialize with records.dumps
+           (pydantic-core's to_json, with no schema validation)
+
+"held" is the memory the results themselves occupy for the rest of the
+search; "peak" is the highest allocation while processing and responding.
+
+    python -m benchmarks.records --results 100 1000 10000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from app.records import dumps, to_records
+from app.schemas import SearchResponse
+from app.services.result_writer import RESULT_COLUMNS, ResultWriter
+from app.services.search_service import SearchService
+
+CREATED_AT = datetime(2025, 1, 10, 12, 30)
+
+def make_results(n: int):
+    rng = random.Random(n)
+    return [{
+        "site": f"site{i % 5}",
+        "type": "flight" if i % 2 else "accommodation",
+        "title": f"Option {i}",
+        "price": round(rng.uniform(20, 2000), 2),
+        "currency": "USD",
+        "link": f"https://example.com/listing/{i}",
+        "description": f"Option {i} in Bariloche",
+        "rating": round(rng.uniform(1, 10), 1),
+        "reviews_count": rng.randint(0, 5000),
+        "image_url": f"https://example.com/img/{i}.jpg",
+    } for i in range(n)]
+
+def response(flights, accommodations, total):
+    return {
+        "id": 1,
+        "best_flight": flights[0] if flights else None,
+        "best_accommodation": accommodations[0] if accommodations else None,
+        "all_flights": flights,
+        "all_accommodations": accommodations,
+        "total_found": total,
+        "timed_out_sites": [],
+        "created_at": CREATED_AT,
+    }
+
+def with_dicts(raw):
+    flights = [r for r in raw if r["type"] == "flight"]
+    accommodations = [r for r in raw if r["type"] == "accommodation"]
+    created_at = datetime.utcnow()
+    rows = [
+        {"search_id": 1, "created_at": created_at, **{column: result.get(column) for column in RESULT_COLUMNS}}
+        for result in raw
+    ]
+    validated = SearchResponse.model_validate(response(flights, accommodations, len(raw)))
+    body = json.dumps(validated.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return rows, body
+
+def with_records(raw):
+    records = to_records(raw)
+    flights, accommodations = SearchService._split(records)
+    rows = ResultWriter.to_rows(1, records)
+    body = dumps(response(flights, accommodations, len(records)))
+    return rows, body
+
+def held(build):
+    tracemalloc.start()
+    kept = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+def measure(func, raw, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(raw)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    func(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'results':>8}  {'pipeline':<8} {'best time':>12} {'peak':>12} {'held':>12}")
+    for size in args.results:
+        raw = make_results(size)
+        assert json.loads(with_dicts(raw)[1]) == json.loads(with_records(raw)[1])
+        # Both pipelines start from the scraper's dicts; records replace them once validated
+        kept = {"dicts": held(lambda: make_results(size)), "records": held(lambda: to_records(make_results(size)))}
+        for name, func in (("dicts", with_dicts), ("records", with_records)):
+            seconds, peak = measure(func, raw, args.repeat)
+            print(f"{size:>8}  {name:<8} {seconds * 1000:>9.2f} ms {peak / 1024:>9.1f} KiB {kept[name] / 1024:>9.1f} KiB")
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
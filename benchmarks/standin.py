@@ -0,0 +1,138 @@
+"""
+Local stand-in for the scraped sites, replaying result pages over HTTP.
+
+Serves each site's fixture (see benchmarks/fixtures.py) at /<site>/<the
+path the scraper requests>, with configurable latency, jitter, error rate
+and page size, so scrapers can be load-tested end to end without touching
+the real sites. Sites that paginate get --pages distinct result pages,
+picked by the spec's page query param, and an empty page after those.
+Point the app at it with SCRAPER_BASE_URLS, which this prints on start:
+
+    python -m benchmarks.standin --port 8900 --latency 0.3 --jitter 0.2 --error-rate 0.02
+    SCRAPER_BASE_URLS='{"Booking.com": "http://127.0.0.1:8900/booking", ...}' SCRAPING_DELAY=0 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from aiohttp import web
+
+from app.scrapers.extractor import ListingSpec
+
+from .fixtures import load_or_render
+from .parsing import SCRAPERS
+
+def _path_pattern(template: str) -> Pattern:
+    # "/hotels/{destination}" matches "/hotels/<anything but a slash>"
+    parts = re.split(r"\{[^}]*\}", template)
+    return re.compile("[^/]+".join(re.escape(part) for part in parts) + "$")
+
+class StandInServer:
+    def __init__(
+        self,
+        latency: float = 0.2,
+        jitter: float = 0.1,
+        error_rate: float = 0.0,
+        items: int = 50,
+        page_kb: int = 300,
+        fixtures: Optional[str] = None,
+        seed: int = 0,
+        pages: int = 3,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        # site -> (path pattern, spec, result pages) for every result type its scraper fetches
+        self.routes: Dict[str, List[Tuple[Pattern, ListingSpec, List[bytes]]]] = {}
+        for site, scraper in SCRAPERS.items():
+            for spec in (scraper.ACCOMMODATIONS, scraper.FLIGHTS):
+                if spec is not None:
+                    result_pages = [
+                        load_or_render(fixtures, site, spec.result_type, items, page_kb, page).encode("utf-8")
+                        for page in range(max(1, pages) if spec.page_param else 1)
+                    ]
+                    self.routes.setdefault(site, []).append((_path_pattern(spec.path), spec, result_pages))
+        self.empty_page = b"<!DOCTYPE html><html><body><main>No results</main></body></html>"
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        delay = self.latency + self.rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.rng.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, text="Service Unavailable")
+        path = "/" + request.match_info["path"]
+        for pattern, spec, result_pages in self.routes.get(request.match_info["site"], []):
+            if pattern.match(path):
+                index = 0
+                if spec.page_param in request.query:
+                    index = (int(request.query[spec.page_param]) - spec.page_start) // spec.page_step
+                page = result_pages[index] if 0 <= index < len(result_pages) else self.empty_page
+                self.bytes_sent += len(page)
+                return web.Response(body=page, content_type="text/html", charset="utf-8")
+        raise web.HTTPNotFound()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Dict[str, str]:
+        """Start serving and return SCRAPER_BASE_URLS pointing every scraper here."""
+        app = web.Application()
+        app.router.add_get("/{site}/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return {scraper.SITE_NAME: f"http://{host}:{self.port}/{name}" for name, scraper in SCRAPERS.items()}
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "errors": self.errors, "bytes_sent": self.bytes_sent}
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before every response")
+    parser.add_argument("--jitter", type=float, default=0.1, help="up to this many extra seconds, uniformly random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--items", type=int, default=50, help="listings per generated page")
+    parser.add_argument("--page-kb", type=int, default=300, help="size generated pages are padded to")
+    parser.add_argument("--fixtures", default=None, help="directory of saved <site>_<type>[_<page>].html pages to replay")
+    parser.add_argument("--pages", type=int, default=3, help="result pages served to sites that paginate")
+
+def from_arguments(args: argparse.Namespace) -> StandInServer:
+    return StandInServer(args.latency, args.jitter, args.error_rate, args.items, args.page_kb, args.fixtures, pages=args.pages)
+
+async def serve(args: argparse.Namespace):
+    server = from_arguments(args)
+    base_urls = await server.start(args.host, args.port)
+    print(f"SCRAPER_BASE_URLS='{json.dumps(base_urls)}'", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
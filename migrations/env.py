@@ -0,0 +1,32 @@
+from logging.config import fileConfig
+from alembic import context
+from app.config import settings
+from app.database import engine, Base
+from app import models  # noqa: F401  (registers the tables on Base.metadata)
+
+if context.config.config_file_name is not None:
+    fileConfig(context.config.config_file_name)
+
+target_metadata = Base.metadata
+
+def run_migrations_offline():
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        # Batch mode lets ALTER COLUMN work on SQLite by rebuilding the table
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
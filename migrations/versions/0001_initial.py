@@ -0,0 +1,63 @@
+"""Initial schema, as created by Base.metadata.create_all before migrations
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_initial"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String()),
+        sa.Column("hashed_password", sa.String()),
+        sa.Column("is_active", sa.Boolean()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "searches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("destination", sa.String()),
+        sa.Column("start_date", sa.DateTime()),
+        sa.Column("end_date", sa.DateTime()),
+        sa.Column("guests", sa.Integer()),
+        sa.Column("budget", sa.Float()),
+        sa.Column("origin", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_searches_id", "searches", ["id"])
+
+    op.create_table(
+        "search_results",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("search_id", sa.Integer(), sa.ForeignKey("searches.id")),
+        sa.Column("site", sa.String()),
+        sa.Column("type", sa.String()),
+        sa.Column("price", sa.Float()),
+        sa.Column("currency", sa.String()),
+        sa.Column("title", sa.String()),
+        sa.Column("description", sa.String()),
+        sa.Column("link", sa.String()),
+        sa.Column("rating", sa.Float(), nullable=True),
+        sa.Column("reviews_count", sa.Integer(), nullable=True),
+        sa.Column("image_url", sa.String(), nullable=True),
+        sa.Column("amenities", sa.String(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_search_results_id", "search_results", ["id"])
+
+def downgrade():
+    op.drop_table("search_results")
+    op.drop_table("searches")
+    op.drop_table("users")
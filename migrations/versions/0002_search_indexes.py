@@ -0,0 +1,78 @@
+"""Indexes for result retrieval, search history and retention; amenities as JSON
+
+Revision ID: 0002_search_indexes
+Revises: 0001_initial
+Create Date: 2026-10-18
+
+On PostgreSQL the indexes are built CONCURRENTLY so a large search_results
+table stays writable while they build.
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_search_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_search_results_search_id_type_price", "search_results", ["search_id", "type", "price"]),
+    ("ix_search_results_created_at", "search_results", ["created_at"]),
+    ("ix_searches_user_id_created_at", "searches", ["user_id", "created_at"]),
+    ("ix_searches_destination_start_date", "searches", ["destination", "start_date"]),
+]
+
+def _split_amenities(value):
+    items = [item.strip() for item in value.split(",")]
+    return [item for item in items if item] or None
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE search_results ALTER COLUMN amenities TYPE JSON USING "
+            "CASE WHEN btrim(coalesce(amenities, '')) = '' THEN NULL "
+            "ELSE array_to_json(regexp_split_to_array(btrim(amenities), '\\s*,\\s*')) END"
+        )
+    else:
+        # Rewrite the comma separated strings as JSON lists before retyping the column
+        rows = bind.execute(sa.text("SELECT id, amenities FROM search_results WHERE amenities IS NOT NULL")).fetchall()
+        for row_id, value in rows:
+            amenities = _split_amenities(value)
+            bind.execute(
+                sa.text("UPDATE search_results SET amenities = :amenities WHERE id = :id"),
+                {"amenities": json.dumps(amenities) if amenities else None, "id": row_id}
+            )
+        with op.batch_alter_table("search_results") as batch:
+            batch.alter_column("amenities", type_=sa.JSON(), existing_type=sa.String(), existing_nullable=True)
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # USING can't hold a subquery, so join the lists into a new column and swap it in
+        op.add_column("search_results", sa.Column("amenities_text", sa.String(), nullable=True))
+        op.execute(
+            "UPDATE search_results SET amenities_text = "
+            "(SELECT string_agg(item, ', ') FROM json_array_elements_text(search_results.amenities) AS item) "
+            "WHERE json_typeof(amenities) = 'array'"
+        )
+        op.drop_column("search_results", "amenities")
+        op.alter_column("search_results", "amenities_text", new_column_name="amenities")
+    else:
+        with op.batch_alter_table("search_results") as batch:
+            batch.alter_column("amenities", type_=sa.String(), existing_type=sa.JSON(), existing_nullable=True)
+        rows = bind.execute(sa.text("SELECT id, amenities FROM search_results WHERE amenities IS NOT NULL")).fetchall()
+        for row_id, value in rows:
+            bind.execute(
+                sa.text("UPDATE search_results SET amenities = :amenities WHERE id = :id"),
+                {"amenities": ", ".join(json.loads(value)), "id": row_id}
+            )
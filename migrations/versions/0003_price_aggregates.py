@@ -0,0 +1,50 @@
+"""Daily price aggregates rolled up from search_results
+
+Revision ID: 0003_price_aggregates
+Revises: 0002_search_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_price_aggregates"
+down_revision = "0002_search_indexes"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "price_aggregates",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("destination", sa.String()),
+        sa.Column("day", sa.Date()),
+        sa.Column("site", sa.String()),
+        sa.Column("type", sa.String()),
+        sa.Column("currency", sa.String()),
+        sa.Column("count", sa.Integer()),
+        sa.Column("min_price", sa.Float()),
+        sa.Column("max_price", sa.Float()),
+        sa.Column("sum_price", sa.Float()),
+        sa.Column("median_price", sa.Float()),
+        sa.Column("p90_price", sa.Float()),
+        sa.Column("histogram", sa.JSON()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_price_aggregates_id", "price_aggregates", ["id"])
+    op.create_index(
+        "uq_price_aggregates_key",
+        "price_aggregates",
+        ["destination", "day", "site", "type", "currency"],
+        unique=True
+    )
+
+    op.create_table(
+        "aggregation_state",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("last_created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_id", sa.Integer()),
+    )
+
+def downgrade():
+    op.drop_table("aggregation_state")
+    op.drop_table("price_aggregates")
@@ -0,0 +1,49 @@
+"""Search status for background searches; scrape_jobs for the job queue
+
+Revision ID: 0004_search_status_jobs
+Revises: 0003_price_aggregates
+Create Date: 2026-10-18
+
+Databases migrated with an earlier 0001_initial, or created by create_all
+after these were added to the models, already have them; those are skipped.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_search_status_jobs"
+down_revision = "0003_price_aggregates"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "status" not in {column["name"] for column in inspector.get_columns("searches")}:
+        # Existing searches all ran to completion before responding
+        op.add_column("searches", sa.Column("status", sa.String(), server_default="done"))
+
+    if not inspector.has_table("scrape_jobs"):
+        op.create_table(
+            "scrape_jobs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("search_id", sa.Integer(), sa.ForeignKey("searches.id")),
+            sa.Column("site", sa.String()),
+            sa.Column("result_type", sa.String()),
+            sa.Column("params", sa.JSON()),
+            sa.Column("status", sa.String()),
+            sa.Column("attempts", sa.Integer()),
+            sa.Column("worker", sa.String(), nullable=True),
+            sa.Column("result_count", sa.Integer(), nullable=True),
+            sa.Column("error", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("started_at", sa.DateTime(), nullable=True),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_scrape_jobs_id", "scrape_jobs", ["id"])
+        op.create_index("ix_scrape_jobs_search_id", "scrape_jobs", ["search_id"])
+        op.create_index("ix_scrape_jobs_status", "scrape_jobs", ["status"])
+
+def downgrade():
+    op.drop_table("scrape_jobs")
+    with op.batch_alter_table("searches") as batch:
+        batch.drop_column("status")
\ No newline at end of file